@@ -5,16 +5,101 @@ This module handles fetching income statements, balance sheets, and key metrics,
 as well as calculating financial ratios for analysis.
 """
 
+import asyncio
+import pickle
+import sqlite3
 import time
 import logging
-import pickle
-from typing import Dict, Optional, Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 import yfinance as yf
+from curl_cffi import requests as curl_requests
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Fields of the financial data payload that are persisted in the cache
+_SCALAR_KEYS = ('ticker', 'company_name', 'market_cap', 'pe_ratio')
+_STATEMENT_KEYS = ('income_statement', 'balance_sheet', 'prev_income_statement')
+_CACHED_KEYS = _SCALAR_KEYS + _STATEMENT_KEYS
+
+# Inputs to the financial ratios: name -> (statement, candidate line-item labels)
+_RATIO_INPUTS = {
+    'current_assets': ('balance_sheet', ('Total Current Assets', 'Current Assets')),
+    'current_liabilities': ('balance_sheet', ('Total Current Liabilities', 'Current Liabilities')),
+    'total_debt': ('balance_sheet', ('Total Debt', 'Total Liabilities Net Minority Interest')),
+    'shareholders_equity': ('balance_sheet', ('Total Stockholders Equity', 'Stockholders Equity')),
+    'net_income': ('income_statement', ('Net Income', 'Net Income Common Stockholders')),
+    'current_revenue': ('income_statement', ('Total Revenue', 'Revenue')),
+    'prev_revenue': ('prev_income_statement', ('Total Revenue', 'Revenue')),
+}
+
+# Line items needed per statement frame (the previous year comes from the income statement)
+_STATEMENT_LABELS = {
+    'income_statement': sorted({
+        label
+        for statement, labels in _RATIO_INPUTS.values()
+        if statement in ('income_statement', 'prev_income_statement')
+        for label in labels
+    }),
+    'balance_sheet': sorted({
+        label
+        for statement, labels in _RATIO_INPUTS.values()
+        if statement == 'balance_sheet'
+        for label in labels
+    }),
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Allows bursts of up to ``capacity`` requests, then throttles callers to
+    ``refill_rate`` requests per second.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Initialize the bucket full.
+
+        Args:
+            capacity: Maximum number of requests that may be made in a burst
+            refill_rate: Tokens added back per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            # Reserve the token now (possibly going negative) so waiting
+            # callers are served in arrival order without retrying.
+            self.tokens -= 1
+            return -self.tokens / self.refill_rate if self.tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Take one token, yielding to the event loop until it is available."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
 
 class DataFetcher:
     """
@@ -22,6 +107,11 @@ class DataFetcher:
     
     Handles API rate limiting, error recovery, and data validation.
     """
+
+    # Maximum number of symbols grouped into one yf.Tickers call
+    BATCH_SIZE = 20
+    # Number of tickers kept decoded in memory in front of the SQLite cache
+    MEMORY_CACHE_SIZE = 512
     
     def __init__(
         self,
@@ -29,61 +119,130 @@ class DataFetcher:
         cache_dir: Optional[Path] = None,
         cache_ttl_hours: float = 24.0,
         use_cache: bool = True,
+        burst_capacity: int = 5,
     ):
         """
         Initialize the DataFetcher.
         
         Args:
-            delay_between_requests: Seconds to wait between API requests to avoid rate limiting
+            delay_between_requests: Average seconds between API requests to avoid rate limiting
+            burst_capacity: Number of requests allowed back-to-back before throttling
         """
         self.delay_between_requests = delay_between_requests
-        self._last_request_time = 0
+        self._bucket = (
+            TokenBucket(capacity=burst_capacity, refill_rate=1.0 / delay_between_requests)
+            if delay_between_requests > 0 else None
+        )
+        # One pooled, keep-alive HTTP session shared by every yfinance call this
+        # fetcher makes; transport errors are retried with exponential backoff.
+        self.session = curl_requests.Session(
+            impersonate='chrome',
+            retry=curl_requests.RetryStrategy(count=2, delay=0.5, backoff='exponential'),
+        )
         self.cache_ttl_seconds = cache_ttl_hours * 3600
+        # Set by prepare_batch() so a whole screen shares one freshness cutoff
+        self._freshness_cutoff: Optional[float] = None
         self.use_cache = use_cache
         self.cache_dir = Path(cache_dir) if cache_dir else Path(__file__).parent.parent.parent / 'data' / 'cache'
+        # All tickers share one SQLite file; WAL lets readers run alongside a writer
+        self.db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        # In-process LRU of decoded cache entries: ticker -> (mtime, data)
+        self._memory_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
         if self.use_cache:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(self.cache_dir / 'cache.sqlite', check_same_thread=False)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            # In WAL mode NORMAL is still crash-safe (a commit is either fully
+            # present or absent); it only skips the fsync on every commit.
+            self.db.execute('PRAGMA synchronous=NORMAL')
+            with self.db:
+                self.db.execute('CREATE TABLE IF NOT EXISTS cache (ticker TEXT PRIMARY KEY, mtime REAL, payload BLOB)')
 
-    def _cache_path(self, ticker: str) -> Path:
-        """Get cache file path for a ticker."""
-        safe_ticker = ticker.upper().replace('/', '_')
-        return self.cache_dir / f"{safe_ticker}.pkl"
-
+    def prepare_batch(self) -> None:
+        """
+        Fix the cache freshness cutoff for the tickers about to be loaded.
+        
+        Cache reads then compare against this cutoff instead of reading the
+        clock for every ticker. Call again before each new batch, and call
+        end_batch() when it is done.
+        """
+        self._freshness_cutoff = time.time() - self.cache_ttl_seconds
+    
+    def end_batch(self) -> None:
+        """Drop the cutoff set by prepare_batch(), so later loads check freshness against the clock again."""
+        self._freshness_cutoff = None
+    
     def _load_cache(self, ticker: str) -> Optional[Dict[str, Any]]:
-        """Load cached data if it exists and is fresh."""
-        cache_path = self._cache_path(ticker)
-        if not cache_path.exists():
+        """
+        Load cached data if it exists and is fresh (None when caching is disabled).
+        
+        Recently used entries are served from memory; the rest are decoded
+        from SQLite and then kept in memory. Entries from memory are shared,
+        so callers must not modify them.
+        """
+        if self.db is None:
             return None
+        key = ticker.upper()
+        cutoff = self._freshness_cutoff
+        if cutoff is None:
+            cutoff = time.time() - self.cache_ttl_seconds
+        with self._memory_lock:
+            entry = self._memory_cache.get(key)
+            if entry is not None:
+                if entry[0] >= cutoff:
+                    self._memory_cache.move_to_end(key)
+                    return entry[1]
+                del self._memory_cache[key]
         try:
-            age_seconds = time.time() - cache_path.stat().st_mtime
-            if age_seconds > self.cache_ttl_seconds:
+            # Stale rows are filtered by the query, so their payload is never read
+            with self._db_lock:
+                row = self.db.execute(
+                    'SELECT mtime, payload FROM cache WHERE ticker = ? AND mtime >= ?',
+                    (key, cutoff),
+                ).fetchone()
+            if row is None:
                 return None
-            with open(cache_path, 'rb') as f:
-                cached = pickle.load(f)
+            cached = pickle.loads(row[1])
             if isinstance(cached, dict):
                 cached['_cache_hit'] = True
+                self._remember(key, row[0], cached)
                 return cached
         except Exception as e:
             logger.warning(f"Failed to read cache for {ticker}: {str(e)}")
         return None
+    
+    def _remember(self, key: str, mtime: float, cached: Dict[str, Any]) -> None:
+        """Keep a decoded cache entry in the in-memory LRU."""
+        with self._memory_lock:
+            self._memory_cache[key] = (mtime, cached)
+            self._memory_cache.move_to_end(key)
+            if len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
 
     def _write_cache(self, ticker: str, data: Dict[str, Any]) -> None:
-        """Write fetched data to cache."""
-        cache_path = self._cache_path(ticker)
+        """
+        Write fetched data to cache (scalars and statement dicts only).
+        
+        The row is written in its own transaction, so a crash or a failed
+        write never leaves a partial entry behind (the old row is kept).
+        """
+        payload = {key: data.get(key) for key in _CACHED_KEYS if key in data}
         try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump(data, f)
+            blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            mtime = time.time()
+            # The connection context manager commits, or rolls back on error
+            with self._db_lock, self.db:
+                self.db.execute(
+                    'INSERT INTO cache (ticker, mtime, payload) VALUES (?, ?, ?) '
+                    'ON CONFLICT(ticker) DO UPDATE SET mtime = excluded.mtime, payload = excluded.payload',
+                    (ticker.upper(), mtime, blob),
+                )
+            self._remember(ticker.upper(), mtime, dict(payload, _cache_hit=True))
         except Exception as e:
             logger.warning(f"Failed to write cache for {ticker}: {str(e)}")
     
-    def _rate_limit(self):
-        """Add delay between requests to avoid rate limiting."""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        if time_since_last < self.delay_between_requests:
-            time.sleep(self.delay_between_requests - time_since_last)
-        self._last_request_time = time.time()
-    
     def get_financial_data(self, ticker: str, retries: int = 3) -> Optional[Dict[str, Any]]:
         """
         Fetch all financial data needed for screening.
@@ -95,26 +254,112 @@ class DataFetcher:
         Returns:
             Dictionary containing financial data, or None if fetch fails
         """
-        if self.use_cache:
+        # Cache hits return here, before any rate limiting or retry setup
+        return self._load_cache(ticker) or self._fetch_uncached(ticker, retries)
+
+    async def aget_financial_data(self, ticker: str, retries: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of get_financial_data().
+        
+        Rate limiting waits on the event loop; the blocking yfinance calls run
+        in a worker thread, so many tickers can be in flight at once.
+        
+        Args:
+            ticker: Stock ticker symbol (e.g., 'AAPL')
+            retries: Number of retry attempts on failure
+            
+        Returns:
+            Dictionary containing financial data, or None if fetch fails
+        """
+        cached = await asyncio.to_thread(self._load_cache, ticker) if self.db is not None else None
+        if cached is not None:
+            return cached
+
+        if self._bucket is not None:
+            await self._bucket.acquire_async()
+        return await asyncio.to_thread(self._fetch_uncached, ticker, retries, None, False)
+
+    def get_financial_data_batch(
+        self,
+        tickers: List[str],
+        retries: int = 3,
+        max_workers: int = 8,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch financial data for many tickers at once.
+        
+        Cached tickers are served from disk; the rest are grouped into chunks of
+        BATCH_SIZE symbols that share one yf.Tickers session and are fetched
+        concurrently.
+        
+        Args:
+            tickers: Stock ticker symbols
+            retries: Number of retry attempts per ticker on failure
+            max_workers: Number of tickers fetched concurrently
+            
+        Returns:
+            Dictionary mapping each ticker to its financial data (None if the fetch failed)
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        misses: List[str] = []
+        for ticker in dict.fromkeys(tickers):
             cached = self._load_cache(ticker)
             if cached is not None:
-                return cached
+                results[ticker] = cached
+            else:
+                misses.append(ticker)
 
-        self._rate_limit()
+        if not misses:
+            return results
+
+        logger.info(f"Fetching {len(misses)} uncached tickers ({len(results)} cache hits)")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(misses)))) as executor:
+            # Submit every chunk before collecting anything, so one slow ticker
+            # never holds back the chunks after it while workers sit idle
+            futures = {}
+            for start in range(0, len(misses), self.BATCH_SIZE):
+                chunk = misses[start:start + self.BATCH_SIZE]
+                batch = yf.Tickers(' '.join(chunk), session=self.session)
+                for ticker in chunk:
+                    future = executor.submit(self._fetch_uncached, ticker, retries, batch.tickers.get(ticker.upper()))
+                    futures[future] = ticker
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    results[ticker] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to fetch data for {ticker}: {str(e)}")
+                    results[ticker] = None
+
+        return results
+
+    def _fetch_uncached(
+        self,
+        ticker: str,
+        retries: int = 3,
+        stock: Optional["yf.Ticker"] = None,
+        rate_limit: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch a ticker from yfinance (bypassing the cache) and cache the result."""
+        if rate_limit and self._bucket is not None:
+            self._bucket.acquire()
         
         for attempt in range(retries):
             try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
+                if stock is None:
+                    stock = yf.Ticker(ticker, session=self.session)
+                info = stock.get_info()
                 
                 # Get financial statements (annual)
                 income_stmt = stock.financials
                 balance_sheet = stock.balance_sheet
                 
-                # Extract key metrics from info
+                # Extract key metrics from info; only these three fields are kept
                 market_cap = info.get('marketCap')
                 pe_ratio = info.get('trailingPE')
                 company_name = info.get('longName', ticker)
+                if market_cap is None:
+                    market_cap = self._fast_market_cap(stock)
                 
                 # Get income statement data (most recent year)
                 if income_stmt.empty:
@@ -126,12 +371,17 @@ class DataFetcher:
                     logger.warning(f"No balance sheet data available for {ticker}")
                     return None
                 
-                # Extract most recent year's data (first column)
-                latest_income = income_stmt.iloc[:, 0] if len(income_stmt.columns) > 0 else pd.Series()
-                latest_balance = balance_sheet.iloc[:, 0] if len(balance_sheet.columns) > 0 else pd.Series()
+                # Keep only the line items the ratios read (a handful out of ~50-80 rows)
+                income_stmt = income_stmt.loc[income_stmt.index.intersection(_STATEMENT_LABELS['income_statement'])]
+                balance_sheet = balance_sheet.loc[balance_sheet.index.intersection(_STATEMENT_LABELS['balance_sheet'])]
+                
+                # Extract most recent year's data (first column) as plain
+                # {label: float} dicts; nothing downstream needs a Series
+                latest_income = self._statement_column(income_stmt, 0)
+                latest_balance = self._statement_column(balance_sheet, 0)
                 
                 # Get previous year for growth calculations
-                prev_income = income_stmt.iloc[:, 1] if len(income_stmt.columns) > 1 else pd.Series()
+                prev_income = self._statement_column(income_stmt, 1)
                 
                 financial_data = {
                     'ticker': ticker,
@@ -141,7 +391,6 @@ class DataFetcher:
                     'income_statement': latest_income,
                     'balance_sheet': latest_balance,
                     'prev_income_statement': prev_income,
-                    'info': info
                 }
                 
                 if self.use_cache:
@@ -158,7 +407,23 @@ class DataFetcher:
         
         return None
     
-    def calculate_ratios(self, financial_data: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    @staticmethod
+    def _statement_column(statement: pd.DataFrame, column: int) -> Dict[str, float]:
+        """Return one period of a statement as a {label: float} dict (empty if the period is missing)."""
+        if len(statement.columns) <= column:
+            return {}
+        return dict(zip(statement.index, statement.iloc[:, column].to_numpy(dtype=np.float64, na_value=np.nan).tolist()))
+    
+    @staticmethod
+    def _fast_market_cap(stock: "yf.Ticker") -> Optional[float]:
+        """Market cap from yfinance's lightweight fast_info, or None if unavailable."""
+        try:
+            return stock.fast_info.get('market_cap')
+        except Exception as e:
+            logger.debug(f"fast_info market cap unavailable for {stock.ticker}: {str(e)}")
+            return None
+    
+    def calculate_ratios(self, financial_data: Dict[str, Any]) -> Dict[str, float]:
         """
         Calculate financial ratios from fetched data.
         
@@ -166,67 +431,139 @@ class DataFetcher:
             financial_data: Dictionary returned by get_financial_data()
             
         Returns:
-            Dictionary with calculated ratios
+            Dictionary with calculated ratios as floats (NaN when missing or undefined)
         """
         if financial_data is None:
             return {}
         
         ratios = {}
-        income = financial_data.get('income_statement', pd.Series())
-        balance = financial_data.get('balance_sheet', pd.Series())
-        prev_income = financial_data.get('prev_income_statement', pd.Series())
+        # Inputs are floats with NaN for missing line items, so NaN propagates
+        # through the arithmetic below without per-field None checks.
+        inputs = self._extract_ratio_inputs(financial_data)
         
         # Current Ratio = Current Assets / Current Liabilities
         # Measures short-term liquidity - ability to pay short-term obligations
         # Higher is better. Values above 1.0 indicate company can cover current liabilities
         # Values between 1.5-3.0 are generally considered healthy
-        current_assets = self._get_value(balance, ['Total Current Assets', 'Current Assets'])
-        current_liabilities = self._get_value(balance, ['Total Current Liabilities', 'Current Liabilities'])
-        
-        if current_assets is not None and current_liabilities is not None and current_liabilities != 0:
-            ratios['current_ratio'] = current_assets / current_liabilities
-        else:
-            ratios['current_ratio'] = None
+        ratios['current_ratio'] = self._safe_ratio(inputs['current_assets'], inputs['current_liabilities'])
         
         # Debt-to-Equity = Total Debt / Total Stockholders Equity
         # Measures financial leverage - how much debt vs equity company uses
         # Lower is generally better (less risky). Values below 1.0 are conservative
         # Values above 2.0 indicate high leverage and higher risk
-        total_debt = self._get_value(balance, ['Total Debt', 'Total Liabilities Net Minority Interest'])
-        shareholders_equity = self._get_value(balance, ['Total Stockholders Equity', 'Stockholders Equity'])
-        
-        if total_debt is not None and shareholders_equity is not None and shareholders_equity != 0:
-            ratios['debt_to_equity'] = total_debt / shareholders_equity
-        else:
-            ratios['debt_to_equity'] = None
+        shareholders_equity = inputs['shareholders_equity']
+        ratios['debt_to_equity'] = self._safe_ratio(inputs['total_debt'], shareholders_equity)
         
         # ROE (Return on Equity) = Net Income / Shareholders Equity
         # Measures how efficiently company uses equity to generate profit
         # Higher is better. Above 15% is generally strong, below 10% may indicate issues
         # Shows management's ability to generate returns for shareholders
-        net_income = self._get_value(income, ['Net Income', 'Net Income Common Stockholders'])
-        if net_income is not None and shareholders_equity is not None and shareholders_equity != 0:
-            ratios['roe'] = net_income / shareholders_equity
-        else:
-            ratios['roe'] = None
+        net_income = inputs['net_income']
+        ratios['roe'] = self._safe_ratio(net_income, shareholders_equity)
         
         # Revenue Growth = (Current Revenue - Previous Revenue) / Previous Revenue
         # Measures year-over-year revenue growth rate
         # Higher is better for growth companies. Positive growth indicates expansion
         # Negative growth may signal declining business
-        current_revenue = self._get_value(income, ['Total Revenue', 'Revenue'])
-        prev_revenue = self._get_value(prev_income, ['Total Revenue', 'Revenue'])
-        
-        if current_revenue is not None and prev_revenue is not None and prev_revenue != 0:
-            ratios['revenue_growth'] = (current_revenue - prev_revenue) / prev_revenue
-        else:
-            ratios['revenue_growth'] = None
+        prev_revenue = inputs['prev_revenue']
+        ratios['revenue_growth'] = self._safe_ratio(inputs['current_revenue'] - prev_revenue, prev_revenue)
         
         # Store net income for positive earnings check
         ratios['net_income'] = net_income
         
         return ratios
+
+    def calculate_ratios_batch(self, financial_data_list: List[Optional[Dict[str, Any]]]) -> pd.DataFrame:
+        """
+        Calculate financial ratios for many tickers with vectorized numpy math.
+        
+        Same formulas as calculate_ratios(), but the inputs for all tickers are
+        gathered into float64 arrays and each ratio is computed in one operation.
+        
+        Args:
+            financial_data_list: Dictionaries returned by get_financial_data() (None entries allowed)
+            
+        Returns:
+            DataFrame with one row per input, in input order, with columns
+            current_ratio, debt_to_equity, roe, revenue_growth and net_income.
+            Missing or undefined values are NaN.
+        """
+        rows = [self._extract_ratio_inputs(data) for data in financial_data_list]
+        inputs = {
+            name: np.asarray([row.get(name, np.nan) for row in rows], dtype=np.float64)
+            for name in _RATIO_INPUTS
+        }
+
+        def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+            return numerator / np.where(denominator != 0, denominator, np.nan)
+
+        equity = inputs['shareholders_equity']
+        return pd.DataFrame({
+            'current_ratio': safe_divide(inputs['current_assets'], inputs['current_liabilities']),
+            'debt_to_equity': safe_divide(inputs['total_debt'], equity),
+            'roe': safe_divide(inputs['net_income'], equity),
+            'revenue_growth': safe_divide(inputs['current_revenue'] - inputs['prev_revenue'], inputs['prev_revenue']),
+            'net_income': inputs['net_income'],
+        })
+
+    def _extract_ratio_inputs(self, financial_data: Optional[Dict[str, Any]]) -> Dict[str, float]:
+        """Extract the raw ratio inputs for one ticker, using NaN for missing values."""
+        if financial_data is None:
+            return {}
+        lookups = {
+            key: self._value_lookup(financial_data.get(key))
+            for key in _STATEMENT_KEYS
+        }
+        inputs = {}
+        for name, (statement, possible_keys) in _RATIO_INPUTS.items():
+            value = self._first_value(lookups[statement], possible_keys)
+            inputs[name] = np.nan if value is None else value
+        return inputs
     
+    @staticmethod
+    def _safe_ratio(numerator: float, denominator: float) -> float:
+        """Divide two floats, returning NaN for a zero denominator (NaN inputs propagate)."""
+        return numerator / denominator if denominator != 0 else np.nan
+    
+    @staticmethod
+    def _value_lookup(series: Union[Dict[Any, Any], pd.Series, None]) -> Dict[Any, Any]:
+        """
+        Return a statement as a plain {label: value} dict.
+        
+        Args:
+            series: Dict of line items (as fetched), a pandas Series (older
+                cache entries), or None
+            
+        Returns:
+            Dictionary of line-item values keyed by label
+        """
+        if series is None:
+            return {}
+        if isinstance(series, dict):
+            return series
+        return dict(zip(series.index, series.to_numpy()))
+
+    @staticmethod
+    def _first_value(values: Dict[Any, Any], possible_keys: list) -> Optional[float]:
+        """
+        Extract the first available value from a dict built by _value_lookup().
+        
+        Args:
+            values: Dictionary returned by _value_lookup()
+            possible_keys: List of possible index names to try, in priority order
+            
+        Returns:
+            Value as float, or None if not found
+        """
+        value = next((values[key] for key in possible_keys if key in values), None)
+        if value is None:
+            return None
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            return None
+        return None if np.isnan(value) else value
+
     def _get_value(self, series: pd.Series, possible_keys: list) -> Optional[float]:
         """
         Extract value from pandas Series using multiple possible key names.
@@ -238,18 +575,4 @@ class DataFetcher:
         Returns:
             Value as float, or None if not found
         """
-        if series.empty:
-            return None
-        
-        for key in possible_keys: # maybe try to narrow down the possible keys to a smaller list of keys that are most likely to be the correct key
-            if key in series.index:
-                value = series[key]
-                # Handle different data types
-                if pd.isna(value):
-                    return None
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return None
-        
-        return None
+        return self._first_value(self._value_lookup(series), possible_keys)
@@ -7,11 +7,64 @@ and load criteria from configuration files.
 
 import yaml
 import logging
-from typing import Dict, List, Optional, Callable, Any, Tuple
+import operator
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Callable, Any, Tuple, Union
 from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from .criteria_numba import OPERATOR_CODES, evaluate_all
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when available, otherwise the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# key=value pairs of an inline criteria string
+_CRITERIA_PAIR = re.compile(r'([^,=]+)=([^,]*)')
+_BOOLEAN_VALUES = {'true': True, 'false': False}
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent / 'config' / 'config.yaml'
+
+# Vectorized form of each criterion: config key -> (metric column, comparison)
+VECTORIZED_CRITERIA = {
+    'market_cap_min': ('market_cap', operator.ge),
+    'pe_max': ('pe_ratio', operator.le),
+    'current_ratio_min': ('current_ratio', operator.ge),
+    'debt_to_equity_max': ('debt_to_equity', operator.le),
+    'revenue_growth_min': ('revenue_growth', operator.ge),
+    'positive_earnings': ('net_income', operator.gt),
+    'roe_min': ('roe', operator.ge),
+}
+
+
+def to_float(value: Any) -> float:
+    """
+    Convert a metric value to float, using NaN for missing or non-numeric values.
+    
+    With NaN for missing data every criterion is a single comparison (NaN
+    compares False); the missing case is only told apart when formatting
+    the failure reason.
+    
+    Args:
+        value: Metric value (number, None or NaN)
+        
+    Returns:
+        Value as float, or NaN
+    """
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
 
 def min_market_cap(value: float) -> Callable:
     """
@@ -24,11 +77,11 @@ def min_market_cap(value: float) -> Callable:
         Function that evaluates if market cap meets minimum
     """
     def evaluate(data: Dict[str, Any]) -> Tuple[bool, str]:
-        market_cap = data.get('market_cap')
-        if market_cap is None:
-            return False, "market_cap_missing"
+        market_cap = to_float(data.get('market_cap'))
         if market_cap >= value:
             return True, ""
+        if np.isnan(market_cap):
+            return False, "market_cap_missing"
         return False, f"market_cap_below_min ({market_cap:,.0f} < {value:,.0f})"
     
     return evaluate
@@ -49,11 +102,11 @@ def max_pe_ratio(value: float) -> Callable:
         Function that evaluates if P/E ratio is below maximum
     """
     def evaluate(data: Dict[str, Any]) -> Tuple[bool, str]:
-        pe_ratio = data.get('pe_ratio')
-        if pe_ratio is None:
-            return False, "pe_ratio_missing"
+        pe_ratio = to_float(data.get('pe_ratio'))
         if pe_ratio <= value:
             return True, ""
+        if np.isnan(pe_ratio):
+            return False, "pe_ratio_missing"
         return False, f"pe_ratio_above_max ({pe_ratio:.2f} > {value:.2f})"
     
     return evaluate
@@ -73,11 +126,11 @@ def min_current_ratio(value: float) -> Callable:
         Function that evaluates if current ratio meets minimum
     """
     def evaluate(data: Dict[str, Any]) -> Tuple[bool, str]:
-        current_ratio = data.get('current_ratio')
-        if current_ratio is None:
-            return False, "current_ratio_missing"
+        current_ratio = to_float(data.get('current_ratio'))
         if current_ratio >= value:
             return True, ""
+        if np.isnan(current_ratio):
+            return False, "current_ratio_missing"
         return False, f"current_ratio_below_min ({current_ratio:.2f} < {value:.2f})"
     
     return evaluate
@@ -97,11 +150,11 @@ def max_debt_to_equity(value: float) -> Callable:
         Function that evaluates if debt-to-equity is below maximum
     """
     def evaluate(data: Dict[str, Any]) -> Tuple[bool, str]:
-        debt_to_equity = data.get('debt_to_equity')
-        if debt_to_equity is None:
-            return False, "debt_to_equity_missing"
+        debt_to_equity = to_float(data.get('debt_to_equity'))
         if debt_to_equity <= value:
             return True, ""
+        if np.isnan(debt_to_equity):
+            return False, "debt_to_equity_missing"
         return False, f"debt_to_equity_above_max ({debt_to_equity:.2f} > {value:.2f})"
     
     return evaluate
@@ -121,11 +174,11 @@ def min_revenue_growth(value: float) -> Callable:
         Function that evaluates if revenue growth meets minimum
     """
     def evaluate(data: Dict[str, Any]) -> Tuple[bool, str]:
-        revenue_growth = data.get('revenue_growth')
-        if revenue_growth is None:
-            return False, "revenue_growth_missing"
+        revenue_growth = to_float(data.get('revenue_growth'))
         if revenue_growth >= value:
             return True, ""
+        if np.isnan(revenue_growth):
+            return False, "revenue_growth_missing"
         return False, f"revenue_growth_below_min ({revenue_growth:.2%} < {value:.2%})"
     
     return evaluate
@@ -142,11 +195,11 @@ def positive_earnings() -> Callable:
         Function that evaluates if net income is positive
     """
     def evaluate(data: Dict[str, Any]) -> Tuple[bool, str]:
-        net_income = data.get('net_income')
-        if net_income is None:
-            return False, "net_income_missing"
+        net_income = to_float(data.get('net_income'))
         if net_income > 0:
             return True, ""
+        if np.isnan(net_income):
+            return False, "net_income_missing"
         return False, f"negative_earnings ({net_income:,.0f})"
     
     return evaluate
@@ -166,16 +219,34 @@ def min_roe(value: float) -> Callable:
         Function that evaluates if ROE meets minimum
     """
     def evaluate(data: Dict[str, Any]) -> Tuple[bool, str]:
-        roe = data.get('roe')
-        if roe is None:
-            return False, "roe_missing"
+        roe = to_float(data.get('roe'))
         if roe >= value:
             return True, ""
+        if np.isnan(roe):
+            return False, "roe_missing"
         return False, f"roe_below_min ({roe:.2%} < {value:.2%})"
     
     return evaluate
 
 
+def load_config_file(config_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Parse a YAML configuration file with the safe (C-accelerated when available) loader.
+    
+    Args:
+        config_path: Path to the YAML file
+        
+    Returns:
+        Parsed configuration (empty dict for an empty file)
+        
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
 def load_criteria_from_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Load screening criteria from YAML configuration file.
@@ -187,7 +258,7 @@ def load_criteria_from_config(config_path: Optional[str] = None) -> Dict[str, An
         Dictionary of criteria configuration
     """
     if config_path is None:
-        config_path = Path(__file__).parent.parent.parent / 'config' / 'config.yaml'
+        config_path = DEFAULT_CONFIG_PATH
     else:
         config_path = Path(config_path)
     
@@ -196,9 +267,7 @@ def load_criteria_from_config(config_path: Optional[str] = None) -> Dict[str, An
         return {}
     
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        
+        config = load_config_file(config_path)
         screener_config = config.get('screener', {})
         return screener_config.get('criteria', {})
     
@@ -207,6 +276,44 @@ def load_criteria_from_config(config_path: Optional[str] = None) -> Dict[str, An
         return {}
 
 
+@lru_cache(maxsize=8)
+def _cached_criteria(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    return load_criteria_from_config(config_path)
+
+
+def load_criteria_cached(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load screening criteria, reusing the parsed config while the file is unchanged.
+    
+    The cache is keyed by path and modification time, so edits to the file are
+    picked up on the next call.
+    
+    Args:
+        config_path: Path to config file. If None, uses default config/config.yaml
+        
+    Returns:
+        Dictionary of criteria configuration (a fresh copy the caller may modify)
+    """
+    path = Path(config_path) if config_path is not None else DEFAULT_CONFIG_PATH
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return load_criteria_from_config(config_path)
+    return dict(_cached_criteria(str(path), mtime_ns))
+
+
+def _convert_criterion_value(value: str) -> Any:
+    """Convert an inline criterion value to bool, float or (as a fallback) str."""
+    boolean = _BOOLEAN_VALUES.get(value.lower())
+    if boolean is not None:
+        return boolean
+    try:
+        # Float handles both integers and decimals
+        return float(value)
+    except ValueError:
+        return value
+
+
 def parse_inline_criteria(criteria_string: str) -> Dict[str, Any]:
     """
     Parse inline criteria string into dictionary.
@@ -223,27 +330,11 @@ def parse_inline_criteria(criteria_string: str) -> Dict[str, Any]:
     if not criteria_string:
         return criteria
     
-    for pair in criteria_string.split(','):
-        pair = pair.strip()
-        if '=' not in pair:
-            continue
-        
-        key, value = pair.split('=', 1)
-        key = key.strip()
-        value = value.strip()
-        
-        # Try to convert to appropriate type
-        if value.lower() == 'true':
-            criteria[key] = True
-        elif value.lower() == 'false':
-            criteria[key] = False
-        else:
-            try:
-                # Try float first (handles decimals)
-                criteria[key] = float(value)
-            except ValueError:
-                # Fall back to string
-                criteria[key] = value
+    # One regex pass over the string; pairs without '=' are skipped. Keys are
+    # interned so they share identity with the criterion names used elsewhere.
+    for match in _CRITERIA_PAIR.finditer(criteria_string):
+        key = sys.intern(match.group(1).strip())
+        criteria[key] = _convert_criterion_value(match.group(2).strip())
     
     return criteria
 
@@ -252,12 +343,33 @@ def build_criteria_functions(criteria_config: Dict[str, Any]) -> List[tuple[str,
     """
     Build list of criterion evaluation functions from configuration.
     
+    Results are memoized per configuration, so repeated calls with the same
+    criteria share the same criterion functions instead of rebuilding them.
+    
     Args:
         criteria_config: Dictionary of criteria values
         
     Returns:
         List of tuples (criterion_name, evaluation_function)
     """
+    # Items keep their order (it decides the order of failure reasons) and
+    # carry the value type, so 25 and 25.0 or True and 1 stay distinct keys
+    key = tuple((name, type(value), value) for name, value in criteria_config.items())
+    try:
+        return list(_build_criteria_functions_cached(key))
+    except TypeError:
+        # Unhashable values (e.g. lists) cannot be cached
+        return list(_build_criteria_functions(criteria_config))
+
+
+@lru_cache(maxsize=256)
+def _build_criteria_functions_cached(key: Tuple[Tuple[str, type, Any], ...]) -> Tuple[Tuple[str, Callable], ...]:
+    """Build (and remember) criterion functions for a hashable view of a config."""
+    return _build_criteria_functions({name: value for name, _, value in key})
+
+
+def _build_criteria_functions(criteria_config: Dict[str, Any]) -> Tuple[Tuple[str, Callable], ...]:
+    """Build criterion functions from configuration (uncached)."""
     functions = []
     
     # Map config keys to criterion builders
@@ -286,7 +398,153 @@ def build_criteria_functions(criteria_config: Dict[str, Any]) -> List[tuple[str,
         else:
             logger.warning(f"Unknown criterion: {key}")
     
-    return functions
+    return tuple(functions)
+
+
+class CriterionSpec(NamedTuple):
+    """One configured criterion as data: pass when `compare(metric, threshold)` is True."""
+    name: str
+    column: str
+    compare: Callable[[Any, Any], Any]
+    threshold: Optional[float]
+    function: Callable
+
+
+def build_criteria_specs(criteria_config: Dict[str, Any]) -> List[CriterionSpec]:
+    """
+    Translate criteria configuration into (name, column, comparison, threshold, function) specs.
+    
+    The comparison and threshold drive the vectorized and compiled evaluators;
+    the criterion function is kept to format human-readable failure reasons.
+    
+    Args:
+        criteria_config: Dictionary of criteria values
+        
+    Returns:
+        List of CriterionSpec, in the same order as build_criteria_functions().
+        threshold is None when the configured value is not numeric.
+    """
+    specs = []
+    for name, criterion_func in build_criteria_functions(criteria_config):
+        column, compare = VECTORIZED_CRITERIA[name]
+        if name == 'positive_earnings':
+            threshold = 0.0
+        else:
+            value = criteria_config[name]
+            threshold = float(value) if isinstance(value, (int, float)) else None
+        specs.append(CriterionSpec(name, column, compare, threshold, criterion_func))
+    return specs
+
+
+_OPERATOR_SYMBOLS = {operator.ge: '>=', operator.le: '<=', operator.gt: '>'}
+
+
+def compile_criteria_evaluator(
+    specs: List[CriterionSpec],
+) -> Optional[Callable[[Dict[str, Any]], Tuple[int, List[str]]]]:
+    """
+    Generate one specialized function that evaluates all criteria at once.
+    
+    The thresholds are baked into the generated source as constants, so each
+    criterion is an inline comparison instead of a closure call. Metrics must
+    be floats (NaN for missing, see to_float). The criterion functions are only
+    called to format the reason when a criterion fails.
+    
+    Args:
+        specs: List returned by build_criteria_specs()
+        
+    Returns:
+        Function mapping an evaluation data dict to (passed_count, failed_criteria),
+        or None if a threshold is not numeric (use the criterion functions instead)
+    """
+    # Specs hold the memoized criterion functions (see build_criteria_functions),
+    # so screeners built from the same criteria reuse one generated evaluator
+    return _compile_criteria_evaluator_cached(tuple(specs))
+
+
+@lru_cache(maxsize=256)
+def _compile_criteria_evaluator_cached(
+    specs: Tuple[CriterionSpec, ...],
+) -> Optional[Callable[[Dict[str, Any]], Tuple[int, List[str]]]]:
+    """Generate (and remember) the specialized evaluator for a tuple of specs."""
+    lines = ['def _evaluate(data):', '    passed = 0', '    failed = []']
+    # repr() writes non-finite thresholds as nan/inf, so both names must resolve
+    namespace: Dict[str, Any] = {'nan': np.nan, 'inf': np.inf}
+    for i, spec in enumerate(specs):
+        if spec.threshold is None:
+            return None
+        namespace[f'_criterion_{i}'] = spec.function
+        lines += [
+            f'    if data.get({spec.column!r}, nan) {_OPERATOR_SYMBOLS[spec.compare]} {spec.threshold!r}:',
+            '        passed += 1',
+            '    else:',
+            f'        failed.append({spec.name + ": "!r} + _criterion_{i}(data)[1])',
+        ]
+    lines.append('    return passed, failed')
+    
+    exec(compile('\n'.join(lines), '<criteria_evaluator>', 'exec'), namespace)
+    return namespace['_evaluate']
+
+
+def evaluate_vectorized(df: pd.DataFrame, specs: List[CriterionSpec]) -> pd.DataFrame:
+    """
+    Evaluate every row of a metrics DataFrame against the configured criteria.
+    
+    All comparisons run in one call to the criteria_numba kernel (JIT-compiled
+    when Numba is installed, numpy otherwise; missing values compare False),
+    and the per-row pass count is the sum of the masks.
+    Failure reasons are only formatted for rows that fail, using the same
+    criterion functions as the per-ticker path.
+    
+    Args:
+        df: DataFrame with one row per ticker and metric columns such as
+            market_cap, pe_ratio, current_ratio, debt_to_equity,
+            revenue_growth, net_income and roe
+        specs: List returned by build_criteria_specs()
+        
+    Returns:
+        DataFrame aligned with df, with columns passed_criteria (int) and
+        failed_criteria (comma-separated reasons, empty when all passed)
+    """
+    columns: Dict[str, np.ndarray] = {}
+    for spec in specs:
+        if spec.column not in columns:
+            if spec.column in df.columns:
+                columns[spec.column] = pd.to_numeric(df[spec.column], errors='coerce').to_numpy(dtype=np.float64)
+            else:
+                columns[spec.column] = np.full(len(df), np.nan)
+    
+    # One kernel call evaluates every ticker against every criterion; a
+    # non-numeric threshold becomes NaN, which never passes
+    if specs:
+        metrics = np.column_stack([columns[spec.column] for spec in specs])
+    else:
+        metrics = np.empty((len(df), 0))
+    thresholds = np.array([np.nan if spec.threshold is None else spec.threshold for spec in specs], dtype=np.float64)
+    ops = np.array([OPERATOR_CODES[spec.compare] for spec in specs], dtype=np.int64)
+    masks = evaluate_all(metrics, thresholds, ops).T
+    
+    failed_criteria = [''] * len(df)
+    for row in np.flatnonzero(~masks.all(axis=0)):
+        data = {column: values[row] for column, values in columns.items()}
+        reasons = []
+        for i, spec in enumerate(specs):
+            if masks[i, row]:
+                continue
+            try:
+                _, failure_reason = spec.function(data)
+            except Exception:
+                failure_reason = 'evaluation_error'
+            reasons.append(f"{spec.name}: {failure_reason}")
+        failed_criteria[row] = ', '.join(reasons)
+    
+    return pd.DataFrame(
+        {
+            'passed_criteria': masks.sum(axis=0),
+            'failed_criteria': failed_criteria,
+        },
+        index=df.index,
+    )
 
 
 def validate_criteria(criteria_config: Dict[str, Any]) -> bool:
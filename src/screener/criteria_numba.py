@@ -0,0 +1,91 @@
+"""
+Numeric kernel for evaluating many tickers against many criteria.
+
+The kernel compares a (tickers x criteria) matrix of metrics against one
+threshold per criterion and returns the pass/fail matrix. When Numba is
+installed the loop version is JIT-compiled; otherwise an equivalent numpy
+broadcast is used. Missing metrics (NaN) and missing thresholds (NaN) never
+pass.
+"""
+
+import operator
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Comparison codes understood by the kernel
+OP_GE = 0
+OP_LE = 1
+OP_GT = 2
+
+OPERATOR_CODES = {operator.ge: OP_GE, operator.le: OP_LE, operator.gt: OP_GT}
+
+
+def _evaluate_all_loops(metrics: np.ndarray, thresholds: np.ndarray, ops: np.ndarray) -> np.ndarray:
+    """Plain loop form of the kernel (the function Numba compiles)."""
+    n_rows, n_criteria = metrics.shape
+    passed = np.zeros((n_rows, n_criteria), dtype=np.bool_)
+    for i in range(n_rows):
+        for j in range(n_criteria):
+            value = metrics[i, j]
+            threshold = thresholds[j]
+            if ops[j] == OP_GE:
+                passed[i, j] = value >= threshold
+            elif ops[j] == OP_LE:
+                passed[i, j] = value <= threshold
+            else:
+                passed[i, j] = value > threshold
+    return passed
+
+
+def _evaluate_all_numpy(metrics: np.ndarray, thresholds: np.ndarray, ops: np.ndarray) -> np.ndarray:
+    """Numpy broadcast form of the kernel, used when Numba is not installed."""
+    with np.errstate(invalid='ignore'):
+        return np.where(
+            ops == OP_GE,
+            metrics >= thresholds,
+            np.where(ops == OP_LE, metrics <= thresholds, metrics > thresholds),
+        )
+
+
+if NUMBA_AVAILABLE:
+    _evaluate_all_impl = njit(cache=True)(_evaluate_all_loops)
+else:
+    _evaluate_all_impl = _evaluate_all_numpy
+
+
+def evaluate_all(metrics: np.ndarray, thresholds: np.ndarray, ops: np.ndarray) -> np.ndarray:
+    """
+    Evaluate every ticker against every criterion.
+
+    Args:
+        metrics: float64 array of shape (n_tickers, n_criteria), NaN for missing
+        thresholds: float64 array of shape (n_criteria,), NaN to fail the criterion
+        ops: int64 array of shape (n_criteria,) with OP_GE, OP_LE or OP_GT
+
+    Returns:
+        Boolean array of shape (n_tickers, n_criteria), True where the criterion passed
+    """
+    return _evaluate_all_impl(
+        np.ascontiguousarray(metrics, dtype=np.float64),
+        np.ascontiguousarray(thresholds, dtype=np.float64),
+        np.ascontiguousarray(ops, dtype=np.int64),
+    )
+
+
+def warm_up() -> None:
+    """Compile the kernel now (no-op without Numba) so the first screen does not pay for it."""
+    if not NUMBA_AVAILABLE:
+        return
+    try:
+        evaluate_all(np.zeros((1, 3)), np.zeros(3), np.array([OP_GE, OP_LE, OP_GT]))
+    except Exception as e:
+        logger.warning(f"Numba warm-up failed: {str(e)}")
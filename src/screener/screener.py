@@ -5,15 +5,25 @@ This module provides the StockScreener class which orchestrates data fetching,
 ratio calculation, and criteria evaluation.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
 import pandas as pd
 
 from ..data.fetcher import DataFetcher
-from .criteria import build_criteria_functions, load_criteria_from_config, parse_inline_criteria
+from . import criteria_numba
+from .criteria import (
+    build_criteria_specs, compile_criteria_evaluator, evaluate_vectorized,
+    load_criteria_from_config, parse_inline_criteria, to_float
+)
 
 logger = logging.getLogger(__name__)
 
+# Result status is stored as a two-category column: int8 codes instead of one
+# Python string per row, so filtering on it is an integer mask compare.
+STATUS_DTYPE = pd.CategoricalDtype(['PASS', 'FAIL'])
+
 
 class StockScreener:
     """
@@ -27,20 +37,28 @@ class StockScreener:
         self,
         criteria_config: Optional[Dict[str, Any]] = None,
         fetcher: Optional[DataFetcher] = None,
+        max_workers: int = 8,
     ):
         """
         Initialize the screener with criteria configuration.
         
         Args:
             criteria_config: Dictionary of criteria values. If None, loads from default config.
+            fetcher: DataFetcher to use. If None, a default DataFetcher is created.
+            max_workers: Number of tickers fetched concurrently in screen_list
         """
         self.fetcher = fetcher or DataFetcher()
+        self.max_workers = max(1, int(max_workers))
         
         if criteria_config is None:
             criteria_config = load_criteria_from_config()
         
         self.criteria_config = criteria_config
-        self.criteria_functions = build_criteria_functions(criteria_config)
+        self.criteria_specs = build_criteria_specs(criteria_config)
+        self.criteria_functions = [(spec.name, spec.function) for spec in self.criteria_specs]
+        self._criteria_evaluator = compile_criteria_evaluator(self.criteria_specs)
+        # Compile the batch kernel up front (no-op without Numba)
+        criteria_numba.warm_up()
         
         logger.info(f"Initialized screener with {len(self.criteria_functions)} criteria")
     
@@ -69,7 +87,19 @@ class StockScreener:
         
         # Fetch financial data
         financial_data = self.fetcher.get_financial_data(ticker)
+        return self._evaluate(ticker, financial_data)
+    
+    def _evaluate(self, ticker: str, financial_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Evaluate already-fetched financial data against all criteria.
         
+        Args:
+            ticker: Stock ticker symbol
+            financial_data: Dictionary returned by DataFetcher.get_financial_data(), or None
+            
+        Returns:
+            Screening result dictionary (see screen_ticker)
+        """
         if financial_data is None:
             logger.warning(f"Could not fetch data for {ticker}")
             return {
@@ -85,31 +115,19 @@ class StockScreener:
         # Calculate ratios
         ratios = self.fetcher.calculate_ratios(financial_data)
         
-        # Combine all data for evaluation
+        # Combine all data for evaluation (floats, NaN for missing)
         evaluation_data = {
-            'market_cap': financial_data.get('market_cap'),
-            'pe_ratio': financial_data.get('pe_ratio'),
-            'current_ratio': ratios.get('current_ratio'),
-            'debt_to_equity': ratios.get('debt_to_equity'),
-            'revenue_growth': ratios.get('revenue_growth'),
-            'net_income': ratios.get('net_income'),
-            'roe': ratios.get('roe'),
+            'market_cap': to_float(financial_data.get('market_cap')),
+            'pe_ratio': to_float(financial_data.get('pe_ratio')),
+            'current_ratio': ratios.get('current_ratio', np.nan),
+            'debt_to_equity': ratios.get('debt_to_equity', np.nan),
+            'revenue_growth': ratios.get('revenue_growth', np.nan),
+            'net_income': ratios.get('net_income', np.nan),
+            'roe': ratios.get('roe', np.nan),
         }
         
         # Evaluate against each criterion
-        passed_count = 0
-        failed_criteria = []
-        
-        for criterion_name, criterion_func in self.criteria_functions:
-            try:
-                passed, failure_reason = criterion_func(evaluation_data)
-                if passed:
-                    passed_count += 1
-                else:
-                    failed_criteria.append(f"{criterion_name}: {failure_reason}")
-            except Exception as e:
-                logger.error(f"Error evaluating criterion {criterion_name} for {ticker}: {str(e)}")
-                failed_criteria.append(f"{criterion_name}: evaluation_error")
+        passed_count, failed_criteria = self._evaluate_criteria(ticker, evaluation_data)
         
         # Determine overall status (all criteria must pass)
         total_criteria = len(self.criteria_functions)
@@ -136,6 +154,42 @@ class StockScreener:
         
         return result
     
+    def _evaluate_criteria(self, ticker: str, evaluation_data: Dict[str, Any]) -> Tuple[int, List[str]]:
+        """
+        Evaluate one ticker's metrics against all criteria.
+        
+        Uses the compiled evaluator when available and falls back to calling
+        each criterion function (which isolates per-criterion errors).
+        
+        Args:
+            ticker: Stock ticker symbol (for logging)
+            evaluation_data: Metrics keyed by name (market_cap, pe_ratio, ...)
+            
+        Returns:
+            Tuple of (number of criteria passed, list of "name: reason" failures)
+        """
+        if self._criteria_evaluator is not None:
+            try:
+                return self._criteria_evaluator(evaluation_data)
+            except Exception as e:
+                logger.debug(f"Compiled criteria evaluator failed for {ticker}, falling back: {str(e)}")
+        
+        passed_count = 0
+        failed_criteria = []
+        
+        for criterion_name, criterion_func in self.criteria_functions:
+            try:
+                passed, failure_reason = criterion_func(evaluation_data)
+                if passed:
+                    passed_count += 1
+                else:
+                    failed_criteria.append(f"{criterion_name}: {failure_reason}")
+            except Exception as e:
+                logger.error(f"Error evaluating criterion {criterion_name} for {ticker}: {str(e)}")
+                failed_criteria.append(f"{criterion_name}: evaluation_error")
+        
+        return passed_count, failed_criteria
+    
     def screen_list(self, tickers: List[str]) -> pd.DataFrame:
         """
         Screen multiple tickers and return results as DataFrame.
@@ -148,43 +202,118 @@ class StockScreener:
         """
         logger.info(f"Screening {len(tickers)} tickers")
         
-        results = []
-        for ticker in tickers:
-            try:
-                result = self.screen_ticker(ticker)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error screening {ticker}: {str(e)}")
-                results.append({
-                    'ticker': ticker,
-                    'company_name': ticker,
-                    'status': 'FAIL',
-                    'error': str(e),
-                    'passed_criteria': 0,
-                    'failed_criteria': 'screening_error'
-                })
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(results)
-        
-        # Ensure consistent column order
-        column_order = [
-            'ticker', 'company_name', 'market_cap', 'pe_ratio',
-            'current_ratio', 'debt_to_equity', 'revenue_growth', 'roe',
-            'passed_criteria', 'total_criteria', 'failed_criteria', 'status'
-        ]
-        
-        # Add any missing columns
-        for col in column_order:
-            if col not in df.columns:
-                df[col] = None
-        
-        # Reorder columns
-        existing_cols = [col for col in column_order if col in df.columns]
-        other_cols = [col for col in df.columns if col not in column_order]
-        df = df[existing_cols + other_cols]
-        
-        return df
+        # Fetch everything up front (cache hits plus concurrent batched
+        # downloads), then evaluate locally without further network calls.
+        self.fetcher.prepare_batch()
+        try:
+            financial_data = self.fetcher.get_financial_data_batch(tickers, max_workers=self.max_workers)
+        finally:
+            # A long-lived fetcher must not keep serving against this batch's cutoff
+            self.fetcher.end_batch()
+        return self._screen_fetched(tickers, financial_data)
+    
+    async def screen_list_async(self, tickers: List[str], concurrency: int = 32) -> pd.DataFrame:
+        """
+        Screen multiple tickers, fetching their data with asyncio.
+        
+        Args:
+            tickers: List of ticker symbols to screen
+            concurrency: Maximum number of fetches in flight at once. The blocking
+                yfinance calls run in the event loop's default executor, so
+                actual parallelism is also capped by that executor's size.
+            
+        Returns:
+            DataFrame with screening results for all tickers (same as screen_list)
+        """
+        logger.info(f"Screening {len(tickers)} tickers (async, concurrency={concurrency})")
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def fetch(ticker: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self.fetcher.aget_financial_data(ticker)
+                except Exception as e:
+                    logger.error(f"Error fetching {ticker}: {str(e)}")
+                    return None
+        
+        self.fetcher.prepare_batch()
+        unique_tickers = list(dict.fromkeys(tickers))
+        try:
+            fetched = await asyncio.gather(*(fetch(ticker) for ticker in unique_tickers))
+        finally:
+            self.fetcher.end_batch()
+        return self._screen_fetched(tickers, dict(zip(unique_tickers, fetched)))
+    
+    def _screen_fetched(
+        self,
+        tickers: List[str],
+        financial_data: Dict[str, Optional[Dict[str, Any]]],
+    ) -> pd.DataFrame:
+        """
+        Evaluate already-fetched data for many tickers and build the results DataFrame.
+        
+        Args:
+            tickers: Ticker symbols, in output order
+            financial_data: Mapping of ticker to fetched data (None or absent if the fetch failed)
+            
+        Returns:
+            DataFrame with screening results for all tickers
+        """
+        data_list = [financial_data.get(ticker) for ticker in tickers]
+        n = len(data_list)
+        
+        # Columns are built as arrays (one contiguous buffer per column) and
+        # the results DataFrame is constructed once at the end.
+        fetched = np.fromiter((data is not None for data in data_list), dtype=bool, count=n)
+        market_caps = np.fromiter(
+            (to_float(data.get('market_cap')) if data else np.nan for data in data_list),
+            dtype=np.float64, count=n,
+        )
+        pe_ratios = np.fromiter(
+            (to_float(data.get('pe_ratio')) if data else np.nan for data in data_list),
+            dtype=np.float64, count=n,
+        )
+        
+        # All ratios in one vectorized pass, then every criterion as one
+        # vectorized comparison across all tickers.
+        ratios_df = self.fetcher.calculate_ratios_batch(data_list)
+        ratios = {
+            column: ratios_df[column].to_numpy(dtype=np.float64)
+            for column in ('current_ratio', 'debt_to_equity', 'revenue_growth', 'roe', 'net_income')
+        }
+        metrics = pd.DataFrame({'market_cap': market_caps, 'pe_ratio': pe_ratios, **ratios})
+        evaluation = evaluate_vectorized(metrics, self.criteria_specs)
+        
+        total_criteria = len(self.criteria_functions)
+        passed_counts = np.where(fetched, evaluation['passed_criteria'].to_numpy(), 0)
+        passed = fetched & (passed_counts == total_criteria)
+        
+        columns = {
+            'ticker': tickers,
+            'company_name': [
+                data.get('company_name', ticker) if data else ticker
+                for ticker, data in zip(tickers, data_list)
+            ],
+            'market_cap': market_caps,
+            'pe_ratio': pe_ratios,
+            'current_ratio': ratios['current_ratio'],
+            'debt_to_equity': ratios['debt_to_equity'],
+            'revenue_growth': ratios['revenue_growth'],
+            'roe': ratios['roe'],
+            'passed_criteria': passed_counts,
+            'total_criteria': np.full(n, total_criteria),
+            'failed_criteria': np.where(fetched, evaluation['failed_criteria'].to_numpy(), 'data_unavailable'),
+            # Codes index STATUS_DTYPE's categories: 0 = PASS, 1 = FAIL
+            'status': pd.Categorical.from_codes(np.where(passed, 0, 1), dtype=STATUS_DTYPE),
+            'net_income': ratios['net_income'],
+        }
+        if not fetched.all():
+            missing = [ticker for ticker, ok in zip(tickers, fetched) if not ok]
+            logger.warning(f"Could not fetch data for {', '.join(missing)}")
+            columns['error'] = np.where(fetched, None, 'data_fetch_failed')
+        
+        logger.info(f"Screened {n} tickers: {int(passed.sum())} passed")
+        return pd.DataFrame(columns)
     
     def filter_by_criteria(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -200,7 +329,13 @@ class StockScreener:
             logger.warning("DataFrame does not have 'status' column, returning as-is")
             return df
         
-        filtered = df[df['status'] == 'PASS'].copy()
+        status = df['status']
+        if isinstance(status.dtype, pd.CategoricalDtype) and 'PASS' in status.cat.categories:
+            # Compare the integer codes rather than the labels
+            mask = status.cat.codes == status.cat.categories.get_loc('PASS')
+        else:
+            mask = status == 'PASS'
+        filtered = df.loc[mask].copy()
         logger.info(f"Filtered to {len(filtered)} passing stocks out of {len(df)} total")
         
         return filtered
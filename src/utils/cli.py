@@ -4,16 +4,20 @@ Command-line interface for the stock screener.
 Provides CLI commands for screening stocks and generating reports.
 """
 
+import asyncio
 import logging
+import mmap
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 import click
-import pandas as pd
 
-from ..screener.screener import StockScreener
-from ..data.fetcher import DataFetcher
-from ..screener.criteria import load_criteria_from_config, parse_inline_criteria
+from .tickers import normalize_tickers
+
+# pandas, yfinance and the screener are imported inside the commands that use
+# them, so `--help` and `web` start without paying for those imports.
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +26,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Ticker files: a ticker is any run of non-separator characters; '#' starts a comment
+_TICKER_TOKEN = re.compile(rb'#[^\n]*|([^,\s#]+)')
+
 
 @click.group()
 def cli():
@@ -95,6 +102,19 @@ def web(host: str, port: int, debug: bool):
     show_default=True,
     help='Cache freshness window in hours'
 )
+@click.option(
+    '--threads',
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help='Number of tickers to fetch and screen concurrently (with --async: fetches in flight)'
+)
+@click.option(
+    '--async',
+    'use_async',
+    is_flag=True,
+    help='Fetch tickers with asyncio (higher concurrency for large ticker lists)'
+)
 def screen(
     tickers: Optional[str],
     tickers_file: Optional[str],
@@ -106,6 +126,8 @@ def screen(
     show: bool,
     no_cache: bool,
     cache_ttl_hours: float,
+    threads: int,
+    use_async: bool,
 ):
     """
     Screen stocks against financial criteria.
@@ -128,20 +150,23 @@ def screen(
     # Only show passing stocks
     python -m src.utils.cli screen --tickers AAPL,MSFT --filter-passed
     """
+    import pandas as pd
+    from ..data.fetcher import DataFetcher
+    from ..screener.criteria import load_config_file, load_criteria_from_config, parse_inline_criteria
+    from ..screener.screener import StockScreener
+    
     # Determine tickers to screen
     ticker_list: List[str] = []
     if tickers:
-        ticker_list = [t.strip().upper() for t in tickers.split(',') if t.strip()]
+        ticker_list = normalize_tickers(tickers)
     elif tickers_file:
         ticker_list = _load_tickers_from_file(Path(tickers_file))
     elif config:
         # Try to load default tickers from config
-        import yaml
         try:
-            with open(config, 'r') as f:
-                config_data = yaml.safe_load(f)
-                screener_config = config_data.get('screener', {})
-                ticker_list = screener_config.get('default_tickers', [])
+            config_data = load_config_file(config)
+            screener_config = config_data.get('screener', {})
+            ticker_list = screener_config.get('default_tickers', [])
         except Exception as e:
             logger.error(f"Error loading default tickers from config: {str(e)}")
             click.echo("Error: Could not load default tickers from config. Please specify --tickers.", err=True)
@@ -178,7 +203,7 @@ def screen(
             cache_ttl_hours=cache_ttl_hours,
             use_cache=not no_cache,
         )
-        screener = StockScreener(criteria_config, fetcher=fetcher)
+        screener = StockScreener(criteria_config, fetcher=fetcher, max_workers=threads)
     except Exception as e:
         click.echo(f"Error initializing screener: {str(e)}", err=True)
         sys.exit(1)
@@ -188,7 +213,10 @@ def screen(
     click.echo(f"Criteria: {len(screener.criteria_functions)} criteria configured\n")
     
     try:
-        results_df = screener.screen_list(ticker_list)
+        if use_async:
+            results_df = asyncio.run(_screen_async(screener, ticker_list, threads))
+        else:
+            results_df = screener.screen_list(ticker_list)
     except Exception as e:
         click.echo(f"Error during screening: {str(e)}", err=True)
         sys.exit(1)
@@ -242,21 +270,31 @@ def screen(
     click.echo("="*60)
 
 
+async def _screen_async(screener, tickers: List[str], threads: int):
+    """Run screen_list_async with `threads` fetches in flight and a thread pool to match."""
+    # The blocking fetches run in the loop's default executor; size it to
+    # --threads so it is not what limits concurrency (asyncio.run shuts it down)
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=threads))
+    return await screener.screen_list_async(tickers, concurrency=threads)
+
+
 if __name__ == '__main__':
     cli()
 
 
 def _load_tickers_from_file(path: Path) -> List[str]:
-    """Load tickers from a file (comma or newline separated)."""
-    content = path.read_text()
-    tickers: List[str] = []
-    for raw_line in content.splitlines():
-        line = raw_line.split('#', 1)[0].strip()
-        if not line:
-            continue
-        parts = [p.strip() for p in line.split(',') if p.strip()]
-        tickers.extend(parts)
-    # Allow a single-line, comma-separated file without newlines
-    if not tickers and content.strip():
-        tickers = [t.strip() for t in content.split(',') if t.strip()]
-    return [t.upper() for t in tickers]
+    """Load unique tickers from a file (comma or newline separated, '#' starts a comment)."""
+    with path.open('rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return []
+        with buffer:
+            # Scan the mapped bytes directly; comments match the first branch
+            # and come back as empty strings
+            tokens = _TICKER_TOKEN.findall(buffer)
+    # dict keys dedupe while keeping first-seen order. Exact duplicates are
+    # dropped on the raw bytes first (a C-level pass), so decode/upper only
+    # runs once per distinct spelling; the second pass folds case variants.
+    return list(dict.fromkeys(token.decode().upper() for token in dict.fromkeys(tokens) if token))
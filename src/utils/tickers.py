@@ -0,0 +1,24 @@
+"""
+Ticker list parsing shared by the CLI and the web app.
+"""
+
+import re
+from typing import List
+
+# Tickers may be separated by commas, newlines or other whitespace
+TICKER_SPLIT = re.compile(r'[,\s]+')
+
+
+def normalize_tickers(raw: str) -> List[str]:
+    """
+    Split a user-supplied ticker string into upper-case symbols.
+    
+    Args:
+        raw: Tickers separated by commas and/or whitespace (e.g. "aapl, msft\ngoogl")
+        
+    Returns:
+        List of ticker symbols in input order (empty for an empty string)
+    """
+    if not raw:
+        return []
+    return [t for t in TICKER_SPLIT.split(raw.upper()) if t]
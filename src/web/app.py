@@ -4,67 +4,334 @@ Minimal Flask app to manage thesis environments and run screenings.
 
 from __future__ import annotations
 
-import json
-import uuid
+import copy
+import html
+import logging
+import os
+import secrets
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
-from flask import Flask, jsonify, request, send_from_directory
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, only the thread lock
+    fcntl = None
+
+from flask import Flask, current_app, jsonify, request, send_from_directory
+from flask.json.provider import JSONProvider
+import numpy as np
+import orjson
 import pandas as pd
-import math
 
 from ..data.fetcher import DataFetcher
-from ..screener.criteria import load_criteria_from_config, parse_inline_criteria
+from ..screener.criteria import load_criteria_cached, parse_inline_criteria
 from ..screener.screener import StockScreener
+from ..utils.tickers import normalize_tickers
+
+logger = logging.getLogger(__name__)
 
 APP_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = APP_ROOT / "data"
 OUTPUTS_DIR = APP_ROOT / "outputs"
 REPORTS_DIR = OUTPUTS_DIR / "reports"
 ENVIRONMENTS_PATH = DATA_DIR / "environments.json"
+# Append-only log of environment changes since environments.json was last written
+ENV_LOG_PATH = DATA_DIR / "environments.log"
+ENV_LOG_COMPACT_AT = 200
+# flock()ed around every read and write of the two files above
+ENV_LOCK_PATH = DATA_DIR / "environments.lock"
+
+# Rows returned with a run (override with ?preview=N) and the page size cap for /results
+RESULTS_PREVIEW_ROWS = 200
+RESULTS_PAGE_MAX = 1000
+
+# One fetcher per process, so its HTTP session and cache connection are reused across runs
+_FETCHER: DataFetcher | None = None
+_FETCHER_LOCK = threading.Lock()
 
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# orjson writes NaN/inf as null; numpy scalars and arrays are serialized natively
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Same argument rules as jsonify(): one positional value, several
+        # (serialized as a list), or keyword arguments (as an object)
+        if args and kwargs:
+            raise TypeError("response() takes either args or kwargs, not both")
+        if len(args) == 1:
+            obj = args[0]
+        else:
+            obj = list(args) or kwargs or None
+        return current_app.response_class(orjson.dumps(obj, option=_ORJSON_OPTIONS), mimetype="application/json")
+
+
 app = Flask(__name__, static_folder="static")
+app.json = OrjsonProvider(app)
+# Static assets may be cached briefly; send_from_directory answers revalidation with 304
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 3600
+
+# Environments (snapshot plus log replayed) keyed by id, in file order. The
+# cache remembers the snapshot mtime and how far into the log it has replayed,
+# so lines appended by another process are picked up on the next access.
+_ENV_CACHE: Dict[str, Any] = {
+    "mtime": None, "by_id": None, "log_offset": 0, "log_mtime": None, "log_entries": 0, "lock_depth": 0,
+    "snapshot_ok": True,
+}
+_ENV_LOCK = threading.RLock()
 
 
 @app.after_request
 def _disable_cache(response):
-    response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    response.headers["Pragma"] = "no-cache"
+    if request.path.startswith("/api/"):
+        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+        response.headers["Pragma"] = "no-cache"
     return response
 
 
+# Constant parts of the HTML report, encoded once; the page title goes between
+# _REPORT_HEAD_OPEN and _REPORT_HEAD_CLOSE
+_REPORT_HEAD_OPEN = b"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>"""
+_REPORT_HEAD_CLOSE = b"""</title>
+  <style>
+    body {
+      font-family: "IBM Plex Sans", "Space Grotesk", "Segoe UI", sans-serif;
+      margin: 32px;
+      color: #111;
+      background: #f7f4ee;
+    }
+    h1 { margin-bottom: 6px; }
+    .meta { color: #555; margin-bottom: 16px; }
+    .analysis {
+      padding: 16px;
+      background: #fff5d7;
+      border-radius: 12px;
+      margin-bottom: 24px;
+    }
+    .section {
+      margin-bottom: 20px;
+      padding: 16px;
+      background: white;
+      border-radius: 14px;
+      border: 1px solid #eee;
+    }
+    .section h2 {
+      margin-top: 0;
+      font-size: 1.1rem;
+    }
+    table {
+      width: 100%;
+      border-collapse: collapse;
+      background: white;
+    }
+    th, td {
+      padding: 10px 12px;
+      border-bottom: 1px solid #eee;
+      text-align: left;
+      font-size: 14px;
+    }
+    th {
+      background: #111;
+      color: #fff;
+      position: sticky;
+      top: 0;
+    }
+  </style>
+</head>
+<body>"""
+_REPORT_FOOTER = b"""</body>
+</html>"""
+
+
+def _get_fetcher() -> DataFetcher:
+    global _FETCHER
+    with _FETCHER_LOCK:
+        if _FETCHER is None:
+            _FETCHER = DataFetcher()
+        return _FETCHER
+
+
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _load_environments() -> List[Dict[str, Any]]:
-    if not ENVIRONMENTS_PATH.exists():
-        return []
+def _snapshot_mtime() -> int | None:
     try:
-        return json.loads(ENVIRONMENTS_PATH.read_text())
-    except Exception:
-        return []
-
+        return ENVIRONMENTS_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
 
-def _save_environments(environments: List[Dict[str, Any]]) -> None:
-    ENVIRONMENTS_PATH.write_text(json.dumps(environments, indent=2))
 
-
-def _find_environment(environments: List[Dict[str, Any]], env_id: str) -> Dict[str, Any] | None:
-    for env in environments:
-        if env.get("id") == env_id:
-            return env
-    return None
+def _log_state() -> Tuple[int, int | None]:
+    """Size and mtime of the environment log ((0, None) when it does not exist)."""
+    try:
+        stat = ENV_LOG_PATH.stat()
+    except OSError:
+        return 0, None
+    return stat.st_size, stat.st_mtime_ns
+
+
+@contextmanager
+def _environments_locked() -> Iterator[None]:
+    """Serialize access to the environment files across threads and, where flock exists, processes."""
+    with _ENV_LOCK:
+        _ENV_CACHE["lock_depth"] += 1
+        lock_file = None
+        try:
+            if fcntl is not None and _ENV_CACHE["lock_depth"] == 1:
+                lock_file = ENV_LOCK_PATH.open("ab")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+            _ENV_CACHE["lock_depth"] -= 1
+
+
+def _read_environment_log(offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Parse the complete log lines from byte `offset` on; return them and the offset past the last newline."""
+    try:
+        with ENV_LOG_PATH.open("rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return [], offset
+    end = data.rfind(b"\n") + 1
+    entries = []
+    for line in data[:end].splitlines():
+        try:
+            entries.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            # A line torn by a crash mid-append
+            continue
+    return entries, offset + end
+
+
+def _apply_environment_changes(by_id: Dict[str, Dict[str, Any]], entries: List[Dict[str, Any]]) -> None:
+    for entry in entries:
+        env = entry.get("env") or {}
+        if entry.get("op") == "delete":
+            by_id.pop(env.get("id"), None)
+        else:
+            by_id[env.get("id")] = env
+
+
+def _compact_environments() -> None:
+    """Rewrite environments.json from the cache and empty the log (caller holds the environments lock)."""
+    if not _ENV_CACHE["snapshot_ok"]:
+        # The cache is missing whatever the unreadable snapshot holds; leave both files alone
+        return
+    environments = list(_ENV_CACHE["by_id"].values())
+    # Write a temp file and swap it in, so a crash or full disk never leaves a
+    # truncated snapshot; the log is only emptied once the new one is in place
+    tmp_path = ENVIRONMENTS_PATH.with_name(ENVIRONMENTS_PATH.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(orjson.dumps(environments, option=orjson.OPT_INDENT_2))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, ENVIRONMENTS_PATH)
+    ENV_LOG_PATH.write_bytes(b"")
+    _ENV_CACHE["mtime"] = ENVIRONMENTS_PATH.stat().st_mtime_ns
+    _ENV_CACHE["log_offset"], _ENV_CACHE["log_mtime"] = _log_state()
+    _ENV_CACHE["log_entries"] = 0
+
+
+def _environments_by_id() -> Dict[str, Dict[str, Any]]:
+    """Return the cached id -> environment index, catching up with the files (caller holds the environments lock)."""
+    mtime = _snapshot_mtime()
+    log_size, log_mtime = _log_state()
+    offset = _ENV_CACHE["log_offset"]
+    rewritten = log_size < offset or (log_size == offset and log_mtime != _ENV_CACHE["log_mtime"])
+    if _ENV_CACHE["by_id"] is None or _ENV_CACHE["mtime"] != mtime or rewritten:
+        environments: List[Dict[str, Any]] = []
+        snapshot_ok = True
+        if mtime is not None:
+            try:
+                environments = orjson.loads(ENVIRONMENTS_PATH.read_bytes())
+            except Exception as e:
+                logger.error(f"Could not read {ENVIRONMENTS_PATH}, not compacting until it is fixed: {str(e)}")
+                snapshot_ok = False
+        _ENV_CACHE["snapshot_ok"] = snapshot_ok
+        by_id = {env.get("id"): env for env in environments}
+        entries, offset = _read_environment_log()
+        _apply_environment_changes(by_id, entries)
+        _ENV_CACHE["by_id"] = by_id
+        _ENV_CACHE["mtime"] = mtime
+        _ENV_CACHE["log_offset"], _ENV_CACHE["log_mtime"] = offset, log_mtime
+        _ENV_CACHE["log_entries"] = len(entries)
+        if log_size:
+            # Fold the log into the snapshot whenever it holds anything, so a
+            # line torn by a crash is dropped instead of lingering in the log
+            _compact_environments()
+    elif log_size > offset:
+        # Lines appended since we last looked (possibly by another process)
+        entries, offset = _read_environment_log(offset)
+        _apply_environment_changes(_ENV_CACHE["by_id"], entries)
+        _ENV_CACHE["log_offset"], _ENV_CACHE["log_mtime"] = offset, log_mtime
+        _ENV_CACHE["log_entries"] += len(entries)
+    return _ENV_CACHE["by_id"]
 
 
-def _normalize_tickers(raw: str) -> List[str]:
-    if not raw:
-        return []
-    return [t.strip().upper() for t in raw.replace("\n", ",").split(",") if t.strip()]
+def _load_environments() -> List[Dict[str, Any]]:
+    with _environments_locked():
+        # Callers may mutate what they get back, so hand out a copy
+        return copy.deepcopy(list(_environments_by_id().values()))
+
+
+def _find_environment(env_id: str) -> Dict[str, Any] | None:
+    with _environments_locked():
+        env = _environments_by_id().get(env_id)
+        return copy.deepcopy(env) if env is not None else None
+
+
+def _record_environment_change(op: str, env: Dict[str, Any]) -> None:
+    """Append an "upsert" or "delete" to the log instead of rewriting environments.json."""
+    with _environments_locked():
+        # Catch up first, so our entry is replayed after everything before it
+        _environments_by_id()
+        with ENV_LOG_PATH.open("a+b") as f:
+            size = f.seek(0, 2)
+            prefix = b""
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    # Never join a line torn by a crash mid-append
+                    prefix = b"\n"
+            f.write(prefix + orjson.dumps({"op": op, "env": env}) + b"\n")
+        # Replaying the new line applies the change to the cache
+        _environments_by_id()
+        if _ENV_CACHE["log_entries"] >= ENV_LOG_COMPACT_AT:
+            _compact_environments()
+
+
+def _top_failures(failed_criteria: pd.Series, limit: int) -> List[str]:
+    """Most frequent individual reasons in a column of comma-joined failure strings."""
+    counts = Counter(
+        chain.from_iterable(str(value).split(", ") for value in failed_criteria.dropna() if value)
+    )
+    return [reason for reason, _ in counts.most_common(limit)]
 
 
 def _generate_analysis(results_df, criteria_count: int) -> str:
@@ -73,9 +340,11 @@ def _generate_analysis(results_df, criteria_count: int) -> str:
 
     passed = results_df[results_df["status"] == "PASS"]
     failed = results_df[results_df["status"] == "FAIL"]
-    avg_pe = results_df["pe_ratio"].dropna().mean()
-    avg_roe = results_df["roe"].dropna().mean()
-    avg_growth = results_df["revenue_growth"].dropna().mean()
+    # One pass over the three columns; mean() skips NaN and gives NaN for an all-missing column
+    means = results_df[["pe_ratio", "roe", "revenue_growth"]].mean(numeric_only=True)
+    avg_pe = means.get("pe_ratio")
+    avg_roe = means.get("roe")
+    avg_growth = means.get("revenue_growth")
 
     lines = [
         f"Pass rate: {len(passed)}/{len(results_df)} tickers met all criteria.",
@@ -83,24 +352,15 @@ def _generate_analysis(results_df, criteria_count: int) -> str:
     ]
     if criteria_count == 0:
         lines.append("No criteria were configured, so all tickers should pass by default.")
-    if avg_pe is not None:
+    if pd.notna(avg_pe):
         lines.append(f"Average P/E: {avg_pe:.2f}.")
-    if avg_roe is not None:
+    if pd.notna(avg_roe):
         lines.append(f"Average ROE: {avg_roe:.2%}.")
-    if avg_growth is not None:
+    if pd.notna(avg_growth):
         lines.append(f"Average revenue growth: {avg_growth:.2%}.")
 
     if not failed.empty:
-        common_failures = (
-            failed["failed_criteria"]
-            .dropna()
-            .str.split(", ")
-            .explode()
-            .value_counts()
-            .head(3)
-            .index
-            .tolist()
-        )
+        common_failures = _top_failures(failed["failed_criteria"], 3)
         if common_failures:
             lines.append("Most common misses: " + "; ".join(common_failures) + ".")
 
@@ -108,10 +368,11 @@ def _generate_analysis(results_df, criteria_count: int) -> str:
 
 
 def _build_report_sections(env: Dict[str, Any], results_df, analysis_text: str) -> Dict[str, str]:
-    thesis = env.get("thesis", "").strip() or "No thesis narrative provided."
-    tickers = ", ".join(env.get("tickers") or [])
+    # User-provided text is escaped before it goes into the report HTML
+    thesis = html.escape(env.get("thesis", "").strip() or "No thesis narrative provided.")
+    tickers = html.escape(", ".join(env.get("tickers") or []))
     criteria_items = env.get("criteria") or {}
-    criteria_text = ", ".join([f"{k}={v}" for k, v in criteria_items.items()]) or "None"
+    criteria_text = html.escape(", ".join([f"{k}={v}" for k, v in criteria_items.items()]) or "None")
     use_defaults = env.get("use_default_criteria", True)
     criteria_mode = "Defaults + custom" if use_defaults else "Custom only"
 
@@ -121,17 +382,7 @@ def _build_report_sections(env: Dict[str, Any], results_df, analysis_text: str)
 
     fail_reasons = []
     if "failed_criteria" in results_df.columns:
-        fail_reasons = (
-            results_df["failed_criteria"]
-            .dropna()
-            .astype(str)
-            .str.split(", ")
-            .explode()
-            .value_counts()
-            .head(5)
-            .index
-            .tolist()
-        )
+        fail_reasons = _top_failures(results_df["failed_criteria"], 5)
 
     missing = []
     if "error" in results_df.columns:
@@ -147,7 +398,7 @@ def _build_report_sections(env: Dict[str, Any], results_df, analysis_text: str)
 
     quantitative = f"""
       <p><strong>Pass/Fail</strong>: {passed} passed · {failed} failed · {total} total</p>
-      <p>{analysis_text}</p>
+      <p>{html.escape(analysis_text)}</p>
     """
 
     risks = "<p>No major issues detected.</p>"
@@ -157,11 +408,11 @@ def _build_report_sections(env: Dict[str, Any], results_df, analysis_text: str)
             parts.append(f"Missing data: {', '.join(missing)}.")
         if fail_reasons:
             parts.append("Common misses: " + "; ".join(fail_reasons) + ".")
-        risks = "<p>" + " ".join(parts) + "</p>"
+        risks = "<p>" + html.escape(" ".join(parts)) + "</p>"
 
     decision = f"""
       <p><strong>Decision</strong>: {ai_summary.get("decision")} · <strong>Confidence</strong>: {ai_summary.get("confidence")}</p>
-      <p>{ai_summary.get("summary")}</p>
+      <p>{html.escape(str(ai_summary.get("summary")))}</p>
     """
 
     return {
@@ -178,75 +429,26 @@ def _write_report(env: Dict[str, Any], results_df, analysis_text: str) -> Dict[s
     csv_path = REPORTS_DIR / f"{base_name}.csv"
     json_path = REPORTS_DIR / f"{base_name}.json"
     html_path = REPORTS_DIR / f"{base_name}.html"
+    parquet_path = REPORTS_DIR / f"{base_name}.parquet"
 
-    results_df.to_csv(csv_path, index=False)
-    json_path.write_text(results_df.to_json(orient="records", indent=2))
+    results_df.to_csv(csv_path, index=False, lineterminator="\n")
+    json_path.write_bytes(
+        orjson.dumps(results_df.to_dict(orient="records"), option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2)
+    )
+    # Parquet is the fast reload source; CSV/JSON stay for people and other tools
+    try:
+        results_df.to_parquet(parquet_path, compression="zstd", index=False)
+    except Exception:
+        parquet_path = None
 
     sections = _build_report_sections(env, results_df, analysis_text)
-    rows_html = "\n".join(
-        [
-            "<tr>" + "".join([f"<td>{value}</td>" for value in row]) + "</tr>"
-            for row in results_df.fillna("").values.tolist()
-        ]
-    )
-    header_html = "".join([f"<th>{col}</th>" for col in results_df.columns])
+    table_html = results_df.to_html(index=False, na_rep="", border=0, classes="results")
+    name = html.escape(env["name"])
 
-    html_path.write_text(
-        f"""<!doctype html>
-<html lang="en">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1">
-  <title>{env['name']} Report</title>
-  <style>
-    body {{
-      font-family: "IBM Plex Sans", "Space Grotesk", "Segoe UI", sans-serif;
-      margin: 32px;
-      color: #111;
-      background: #f7f4ee;
-    }}
-    h1 {{ margin-bottom: 6px; }}
-    .meta {{ color: #555; margin-bottom: 16px; }}
-    .analysis {{
-      padding: 16px;
-      background: #fff5d7;
-      border-radius: 12px;
-      margin-bottom: 24px;
-    }}
-    .section {{
-      margin-bottom: 20px;
-      padding: 16px;
-      background: white;
-      border-radius: 14px;
-      border: 1px solid #eee;
-    }}
-    .section h2 {{
-      margin-top: 0;
-      font-size: 1.1rem;
-    }}
-    table {{
-      width: 100%;
-      border-collapse: collapse;
-      background: white;
-    }}
-    th, td {{
-      padding: 10px 12px;
-      border-bottom: 1px solid #eee;
-      text-align: left;
-      font-size: 14px;
-    }}
-    th {{
-      background: #111;
-      color: #fff;
-      position: sticky;
-      top: 0;
-    }}
-  </style>
-</head>
-<body>
-  <h1>{env['name']} Thesis Report</h1>
-  <div class="meta">Run ID {base_name} · Generated {datetime.now(timezone.utc).isoformat()}</div>
-  <div class="analysis">{analysis_text}</div>
+    body = f"""
+  <h1>{name} Thesis Report</h1>
+  <div class="meta">Run ID {html.escape(base_name)} · Generated {datetime.now(timezone.utc).isoformat()}</div>
+  <div class="analysis">{html.escape(analysis_text)}</div>
   <div class="section">
     <h2>Overview</h2>
     {sections["overview"]}
@@ -263,49 +465,59 @@ def _write_report(env: Dict[str, Any], results_df, analysis_text: str) -> Dict[s
     <h2>Decision Narrative</h2>
     {sections["decision"]}
   </div>
-  <table>
-    <thead><tr>{header_html}</tr></thead>
-    <tbody>{rows_html}</tbody>
-  </table>
-</body>
-</html>"""
-    )
-
-    return {
+  {table_html}
+"""
+    with html_path.open("wb") as f:
+        f.writelines([
+            _REPORT_HEAD_OPEN,
+            f"{name} Report".encode(),
+            _REPORT_HEAD_CLOSE,
+            body.encode(),
+            _REPORT_FOOTER,
+        ])
+
+    report_paths = {
         "run_id": base_name,
         "csv": str(csv_path),
         "json": str(json_path),
         "html": str(html_path),
     }
+    if parquet_path is not None:
+        report_paths["parquet"] = str(parquet_path)
+    return report_paths
 
 
-def _sanitize_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Replace NaN/inf values with None for safe JSON encoding."""
-    sanitized: List[Dict[str, Any]] = []
-    for record in records:
-        clean: Dict[str, Any] = {}
-        for key, value in record.items():
-            if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-                clean[key] = None
-            else:
-                clean[key] = value
-        sanitized.append(clean)
-    return sanitized
-
-
-def _load_latest_results(env: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Load latest results from the last report JSON file."""
+def _load_latest_results_frame(env: Dict[str, Any]) -> pd.DataFrame:
+    """Load latest results from the last report (Parquet when available, else JSON)."""
     report = env.get("last_report") or {}
+    parquet_path = report.get("parquet")
+    if parquet_path and Path(parquet_path).exists():
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception:
+            pass
     json_path = report.get("json")
     if not json_path:
-        return []
+        return pd.DataFrame()
     path = Path(json_path)
     if not path.exists():
-        return []
+        return pd.DataFrame()
     try:
-        return json.loads(path.read_text())
+        return pd.DataFrame(orjson.loads(path.read_bytes()))
     except Exception:
-        return []
+        return pd.DataFrame()
+
+
+def _load_latest_results(env: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Load latest results from the last report as a list of records."""
+    return _load_latest_results_frame(env).to_dict(orient="records")
+
+
+def _records_for_json(results_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a results frame to records with NaN/inf replaced by None."""
+    # Swap NaN/inf for None column-wise instead of walking every record
+    clean_df = results_df.replace([np.inf, -np.inf], np.nan)
+    return clean_df.astype(object).where(clean_df.notna(), None).to_dict(orient="records")
 
 
 def _generate_ai_summary(env: Dict[str, Any], results: List[Dict[str, Any]]) -> Dict[str, str]:
@@ -324,17 +536,7 @@ def _generate_ai_summary(env: Dict[str, Any], results: List[Dict[str, Any]]) ->
 
     top_failures = []
     if "failed_criteria" in df.columns:
-        top_failures = (
-            df["failed_criteria"]
-            .dropna()
-            .astype(str)
-            .str.split(", ")
-            .explode()
-            .value_counts()
-            .head(3)
-            .index
-            .tolist()
-        )
+        top_failures = _top_failures(df["failed_criteria"], 3)
 
     thesis = env.get("thesis", "").strip()
     thesis_line = f"Thesis: {thesis}" if thesis else "No thesis narrative provided."
@@ -364,12 +566,13 @@ def _generate_ai_summary(env: Dict[str, Any], results: List[Dict[str, Any]]) ->
 
 @app.route("/")
 def index():
-    return send_from_directory(app.static_folder, "index.html")
+    # Always revalidate the page itself (cheap 304 when unchanged) so UI updates show up
+    return send_from_directory(app.static_folder, "index.html", conditional=True, etag=True, max_age=0)
 
 
 @app.route("/<path:path>")
 def static_files(path: str):
-    return send_from_directory(app.static_folder, path)
+    return send_from_directory(app.static_folder, path, conditional=True, etag=True)
 
 
 @app.route("/api/environments", methods=["GET"])
@@ -380,71 +583,67 @@ def list_environments():
 @app.route("/api/environments", methods=["POST"])
 def create_environment():
     payload = request.get_json(force=True) or {}
-    envs = _load_environments()
 
-    env_id = str(uuid.uuid4())
+    # Hex ids have no '-' (report files are named {env_id}_{timestamp}.*); existing ids are kept
+    env_id = secrets.token_hex(12)
     env = {
         "id": env_id,
         "name": payload.get("name", "Untitled Thesis").strip() or "Untitled Thesis",
         "thesis": payload.get("thesis", "").strip(),
-        "tickers": _normalize_tickers(payload.get("tickers", "")),
+        "tickers": normalize_tickers(payload.get("tickers", "")),
         "criteria": parse_inline_criteria(payload.get("criteria", "")),
         "use_default_criteria": bool(payload.get("use_default_criteria", True)),
         "created_at": _utc_now(),
         "updated_at": _utc_now(),
     }
-    envs.append(env)
-    _save_environments(envs)
+    _record_environment_change("upsert", env)
     return jsonify(env), 201
 
 
 @app.route("/api/environments/<env_id>", methods=["PUT"])
 def update_environment(env_id: str):
     payload = request.get_json(force=True) or {}
-    envs = _load_environments()
-    env = _find_environment(envs, env_id)
+    env = _find_environment(env_id)
     if env is None:
         return jsonify({"error": "not_found"}), 404
 
     env["name"] = payload.get("name", env.get("name")).strip() or env["name"]
     env["thesis"] = payload.get("thesis", env.get("thesis", "")).strip()
-    env["tickers"] = _normalize_tickers(payload.get("tickers", "")) or env.get("tickers", [])
+    env["tickers"] = normalize_tickers(payload.get("tickers", "")) or env.get("tickers", [])
     env["criteria"] = parse_inline_criteria(payload.get("criteria", "")) or env.get("criteria", {})
     if "use_default_criteria" in payload:
         env["use_default_criteria"] = bool(payload.get("use_default_criteria"))
     env["updated_at"] = _utc_now()
-    _save_environments(envs)
+    _record_environment_change("upsert", env)
     return jsonify(env)
 
 
 @app.route("/api/environments/<env_id>", methods=["DELETE"])
 def delete_environment(env_id: str):
-    envs = _load_environments()
-    env = _find_environment(envs, env_id)
+    env = _find_environment(env_id)
     if env is None:
         return jsonify({"error": "not_found"}), 404
-    envs = [item for item in envs if item.get("id") != env_id]
-    _save_environments(envs)
+    _record_environment_change("delete", {"id": env_id})
     return jsonify({"status": "deleted"})
 
 
 @app.route("/api/environments/<env_id>/run", methods=["POST"])
 def run_environment(env_id: str):
-    envs = _load_environments()
-    env = _find_environment(envs, env_id)
+    env = _find_environment(env_id)
     if env is None:
         return jsonify({"error": "not_found"}), 404
 
     criteria = {}
     if env.get("use_default_criteria", True):
-        criteria = load_criteria_from_config()
+        criteria = load_criteria_cached()
     criteria.update(env.get("criteria") or {})
     tickers = env.get("tickers") or []
     if not tickers:
         return jsonify({"error": "no_tickers"}), 400
 
-    fetcher = DataFetcher()
-    screener = StockScreener(criteria, fetcher=fetcher)
+    fetcher = _get_fetcher()
+    # screen_list fetches cache misses concurrently; size the pool to the thesis
+    screener = StockScreener(criteria, fetcher=fetcher, max_workers=min(16, len(tickers)))
     results_df = screener.screen_list(tickers)
     analysis_text = _generate_analysis(results_df, len(screener.criteria_functions))
     report_paths = _write_report(env, results_df, analysis_text)
@@ -461,10 +660,12 @@ def run_environment(env_id: str):
 
     env["last_run_at"] = _utc_now()
     env["last_report"] = report_paths
-    _save_environments(envs)
+    _record_environment_change("upsert", env)
 
-    raw_records = results_df.to_dict(orient="records")
-    sanitized_records = _sanitize_records(raw_records)
+    # Only the first `preview` rows go in the response; the rest are paged
+    # from the saved report via the /results endpoint
+    preview = max(0, request.args.get("preview", RESULTS_PREVIEW_ROWS, type=int))
+    sanitized_records = _records_for_json(results_df.head(preview))
     response = {
         "environment": env,
         "summary": {
@@ -483,10 +684,26 @@ def run_environment(env_id: str):
     return jsonify(response)
 
 
+@app.route("/api/environments/<env_id>/results", methods=["GET"])
+def environment_results(env_id: str):
+    env = _find_environment(env_id)
+    if env is None:
+        return jsonify({"error": "not_found"}), 404
+
+    offset = max(0, request.args.get("offset", 0, type=int))
+    limit = min(max(0, request.args.get("limit", RESULTS_PREVIEW_ROWS, type=int)), RESULTS_PAGE_MAX)
+    results_df = _load_latest_results_frame(env)
+    return jsonify({
+        "total": len(results_df),
+        "offset": offset,
+        "limit": limit,
+        "results": _records_for_json(results_df.iloc[offset:offset + limit]),
+    })
+
+
 @app.route("/api/environments/<env_id>/ai-summary", methods=["POST"])
 def ai_summary(env_id: str):
-    envs = _load_environments()
-    env = _find_environment(envs, env_id)
+    env = _find_environment(env_id)
     if env is None:
         return jsonify({"error": "not_found"}), 404
 
@@ -7,14 +7,19 @@ Tests screening functionality, criteria evaluation, and error handling.
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
-from src.screener.screener import StockScreener
+from src.screener.screener import STATUS_DTYPE, StockScreener
+from src.data.fetcher import DataFetcher, TokenBucket
 from src.utils.cli import _load_tickers_from_file
+from src.utils.tickers import normalize_tickers
+from src.screener import criteria_numba
 from src.screener.criteria import (
     min_market_cap, max_pe_ratio, min_current_ratio,
     max_debt_to_equity, min_revenue_growth, positive_earnings, min_roe,
-    build_criteria_functions, parse_inline_criteria
+    build_criteria_functions, build_criteria_specs, compile_criteria_evaluator,
+    load_config_file, load_criteria_cached, parse_inline_criteria
 )
 
 
@@ -130,6 +135,10 @@ class TestCriteriaFunctions(unittest.TestCase):
         passed, reason = criterion(data)
         self.assertFalse(passed)
         self.assertIn("missing", reason.lower())
+        
+        passed, reason = criterion({'market_cap': float('nan')})
+        self.assertFalse(passed)
+        self.assertIn("missing", reason.lower())
 
 
 class TestCriteriaParsing(unittest.TestCase):
@@ -150,6 +159,38 @@ class TestCriteriaParsing(unittest.TestCase):
         result = parse_inline_criteria(criteria_str)
         
         self.assertTrue(result['positive_earnings'])
+
+    def test_parse_inline_criteria_whitespace_and_junk(self):
+        """Test that whitespace is stripped and pairs without '=' are skipped."""
+        result = parse_inline_criteria(" pe_max = 25 , junk, positive_earnings=False ")
+
+        self.assertEqual(result, {'pe_max': 25.0, 'positive_earnings': False})
+
+    def test_load_criteria_cached(self):
+        """Cached config loads return copies and pick up file changes."""
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'config.yaml'
+            path.write_text("screener:\n  criteria:\n    pe_max: 25\n")
+            os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+            first = load_criteria_cached(str(path))
+            first['pe_max'] = 99
+            self.assertEqual(load_criteria_cached(str(path)), {'pe_max': 25})
+            
+            path.write_text("screener:\n  criteria:\n    pe_max: 30\n")
+            os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+            self.assertEqual(load_criteria_cached(str(path)), {'pe_max': 30})
+
+    def test_load_config_file(self):
+        """The whole config is returned, and an empty file parses as an empty dict."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'config.yaml'
+            path.write_text("screener:\n  default_tickers: [AAPL, MSFT]\n")
+            self.assertEqual(load_config_file(path), {'screener': {'default_tickers': ['AAPL', 'MSFT']}})
+            path.write_text("")
+            self.assertEqual(load_config_file(str(path)), {})
     
     def test_build_criteria_functions(self):
         """Test building criterion functions from config."""
@@ -163,6 +204,94 @@ class TestCriteriaParsing(unittest.TestCase):
         self.assertEqual(len(functions), 3)
         self.assertTrue(all(isinstance(f[1], type(lambda x: x)) or callable(f[1]) for f in functions))
 
+    def test_build_criteria_functions_memoized(self):
+        """Repeated builds of the same config share the criterion functions."""
+        config = {'pe_max': 25, 'positive_earnings': True}
+        first = build_criteria_functions(config)
+        second = build_criteria_functions(dict(config))
+
+        self.assertIsNot(first, second)
+        self.assertTrue(all(a[1] is b[1] for a, b in zip(first, second)))
+        # A different value type is a different config
+        self.assertIsNot(build_criteria_functions({'pe_max': 25.0})[0][1], first[0][1])
+        # Unhashable values are built without the cache
+        self.assertEqual(build_criteria_functions({'pe_max': 25, 'tags': ['a']})[0][0], 'pe_max')
+
+    def test_build_criteria_specs(self):
+        """Test criteria translate to (name, column, comparison, threshold) specs."""
+        import operator
+        config = {'pe_max': 25, 'positive_earnings': True, 'roe_min': 'high'}
+        specs = build_criteria_specs(config)
+        
+        self.assertEqual(
+            [(spec.name, spec.column, spec.compare, spec.threshold) for spec in specs],
+            [
+                ('pe_max', 'pe_ratio', operator.le, 25.0),
+                ('positive_earnings', 'net_income', operator.gt, 0.0),
+                ('roe_min', 'roe', operator.ge, None),
+            ]
+        )
+    
+    def test_compiled_evaluator_matches_functions(self):
+        """Test the compiled evaluator agrees with calling each criterion function."""
+        config = {
+            'market_cap_min': 1000000000,
+            'pe_max': 25,
+            'current_ratio_min': 1.0,
+            'positive_earnings': True,
+            'roe_min': 0.1
+        }
+        functions = build_criteria_functions(config)
+        evaluator = compile_criteria_evaluator(build_criteria_specs(config))
+        
+        samples = [
+            {'market_cap': 2e9, 'pe_ratio': 20, 'current_ratio': 1.5, 'net_income': 1e6, 'roe': 0.2},
+            {'market_cap': 5e8, 'pe_ratio': np.nan, 'current_ratio': 0.5, 'net_income': -1.0, 'roe': 0.1},
+            {},
+        ]
+        for data in samples:
+            expected_failed = []
+            for name, func in functions:
+                passed, reason = func(data)
+                if not passed:
+                    expected_failed.append(f"{name}: {reason}")
+            passed_count, failed = evaluator(data)
+            self.assertEqual(failed, expected_failed)
+            self.assertEqual(passed_count, len(functions) - len(expected_failed))
+    
+    def test_compiled_evaluator_rejects_non_numeric_threshold(self):
+        """Test non-numeric thresholds fall back to the criterion functions."""
+        config = {'pe_max': '25'}
+        self.assertIsNone(compile_criteria_evaluator(build_criteria_specs(config)))
+
+    def test_compiled_evaluator_infinite_thresholds(self):
+        """Test infinite thresholds compile into a working evaluator."""
+        evaluate = compile_criteria_evaluator(build_criteria_specs(
+            {'pe_max': float('inf'), 'market_cap_min': float('-inf')}
+        ))
+        self.assertEqual(evaluate({'pe_ratio': 1e300, 'market_cap': 0.0}), (2, []))
+        passed, failed = evaluate({'pe_ratio': float('nan'), 'market_cap': 0.0})
+        self.assertEqual(passed, 1)
+        self.assertIn('pe_ratio_missing', failed[0])
+
+
+class TestCriteriaKernel(unittest.TestCase):
+    """Test the batch criteria kernel against its reference forms."""
+    
+    def test_kernel_implementations_agree(self):
+        """The active kernel, the loop form and the numpy form give identical masks."""
+        rng = np.random.default_rng(0)
+        metrics = rng.normal(size=(50, 4))
+        metrics[rng.random(metrics.shape) < 0.2] = np.nan
+        thresholds = np.array([0.0, 0.5, np.nan, -0.5])
+        ops = np.array([criteria_numba.OP_GE, criteria_numba.OP_LE, criteria_numba.OP_GE, criteria_numba.OP_GT])
+        
+        expected = criteria_numba._evaluate_all_loops(metrics, thresholds, ops)
+        for implementation in (criteria_numba.evaluate_all, criteria_numba._evaluate_all_numpy):
+            with self.subTest(implementation=implementation.__name__):
+                np.testing.assert_array_equal(implementation(metrics, thresholds, ops), expected)
+        self.assertFalse(expected[:, 2].any())
+
 
 class TestStockScreener(unittest.TestCase):
     """Test StockScreener class."""
@@ -185,9 +314,9 @@ class TestStockScreener(unittest.TestCase):
             'company_name': 'Apple Inc.',
             'market_cap': 2000000000,
             'pe_ratio': 20,
-            'income_statement': pd.Series({'Total Revenue': 100000000}),
-            'balance_sheet': pd.Series({'Total Current Assets': 150000000, 'Total Current Liabilities': 100000000}),
-            'prev_income_statement': pd.Series({'Total Revenue': 90000000}),
+            'income_statement': {'Total Revenue': 100000000},
+            'balance_sheet': {'Total Current Assets': 150000000, 'Total Current Liabilities': 100000000},
+            'prev_income_statement': {'Total Revenue': 90000000},
             'info': {}
         }
         mock_fetcher.calculate_ratios.return_value = {
@@ -207,6 +336,26 @@ class TestStockScreener(unittest.TestCase):
         self.assertIn('status', result)
         self.assertIn('passed_criteria', result)
     
+    def test_criteria_built_once(self):
+        """Criteria are built in __init__ and reused by every screen_ticker call."""
+        fetcher = Mock()
+        fetcher.get_financial_data.return_value = {'ticker': 'AAPL', 'market_cap': 2e9, 'pe_ratio': 20}
+        fetcher.calculate_ratios.return_value = {'current_ratio': 2.0}
+        with patch('src.screener.screener.build_criteria_specs', wraps=build_criteria_specs) as mock_build:
+            screener = StockScreener(self.criteria_config, fetcher=fetcher)
+            results = [screener.screen_ticker(ticker) for ticker in ('AAPL', 'MSFT', 'GOOGL')]
+        
+        mock_build.assert_called_once_with(self.criteria_config)
+        self.assertTrue(all(result['status'] == 'PASS' for result in results))
+
+    def test_screeners_share_compiled_evaluator(self):
+        """Screeners with the same criteria reuse one generated evaluator."""
+        first = StockScreener(self.criteria_config, fetcher=Mock())
+        second = StockScreener(dict(self.criteria_config), fetcher=Mock())
+
+        self.assertIsNotNone(first._criteria_evaluator)
+        self.assertIs(first._criteria_evaluator, second._criteria_evaluator)
+
     @patch('src.screener.screener.DataFetcher')
     def test_screen_ticker_fetch_failure(self, mock_fetcher_class):
         """Test handling of data fetch failure."""
@@ -230,9 +379,9 @@ class TestStockScreener(unittest.TestCase):
             'company_name': 'Apple Inc.',
             'market_cap': 2000000000,
             'pe_ratio': 20,
-            'income_statement': pd.Series({'Total Revenue': 100000000}),
-            'balance_sheet': pd.Series({'Total Current Assets': 150000000, 'Total Current Liabilities': 100000000}),
-            'prev_income_statement': pd.Series({'Total Revenue': 90000000}),
+            'income_statement': {'Total Revenue': 100000000},
+            'balance_sheet': {'Total Current Assets': 150000000, 'Total Current Liabilities': 100000000},
+            'prev_income_statement': {'Total Revenue': 90000000},
             'info': {}
         }
         mock_fetcher.calculate_ratios.return_value = {
@@ -242,6 +391,12 @@ class TestStockScreener(unittest.TestCase):
             'roe': 0.20,
             'net_income': 10000000
         }
+        mock_fetcher.get_financial_data_batch.side_effect = lambda tickers, **kwargs: {
+            ticker: mock_fetcher.get_financial_data.return_value for ticker in tickers
+        }
+        mock_fetcher.calculate_ratios_batch.side_effect = lambda data_list: pd.DataFrame(
+            [mock_fetcher.calculate_ratios.return_value] * len(data_list)
+        )
         mock_fetcher_class.return_value = mock_fetcher
         
         screener = StockScreener(self.criteria_config)
@@ -251,6 +406,92 @@ class TestStockScreener(unittest.TestCase):
         self.assertEqual(len(results_df), 2)
         self.assertIn('ticker', results_df.columns)
         self.assertIn('status', results_df.columns)
+        self.assertEqual(results_df['status'].dtype, STATUS_DTYPE)
+
+    @patch('src.screener.screener.DataFetcher')
+    def test_screen_list_preserves_order(self, mock_fetcher_class):
+        """Test batched screening returns rows in input order."""
+        mock_fetcher = Mock()
+        mock_fetcher.get_financial_data_batch.return_value = {}
+        mock_fetcher.calculate_ratios_batch.side_effect = DataFetcher(use_cache=False).calculate_ratios_batch
+        mock_fetcher_class.return_value = mock_fetcher
+
+        tickers = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META']
+        screener = StockScreener(self.criteria_config, max_workers=4)
+        results_df = screener.screen_list(tickers)
+
+        self.assertEqual(results_df['ticker'].tolist(), tickers)
+
+    def test_screen_list_async(self):
+        """Async screening fetches each ticker once and keeps input order."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        fetcher = DataFetcher(use_cache=False)
+        fetcher.aget_financial_data = AsyncMock(side_effect=lambda ticker: {
+            'ticker': ticker, 'company_name': ticker.title(), 'market_cap': 5e9, 'pe_ratio': 10.0,
+        } if ticker != 'MISSING' else None)
+        screener = StockScreener(self.criteria_config, fetcher=fetcher)
+
+        results_df = asyncio.run(screener.screen_list_async(['MSFT', 'MISSING', 'AAPL', 'MSFT']))
+
+        self.assertEqual(results_df['ticker'].tolist(), ['MSFT', 'MISSING', 'AAPL', 'MSFT'])
+        self.assertEqual(fetcher.aget_financial_data.await_count, 3)
+        self.assertEqual(results_df['company_name'].tolist()[0], 'Msft')
+        self.assertEqual(results_df['failed_criteria'].tolist()[1], 'data_unavailable')
+
+    def test_screen_list_matches_screen_ticker(self):
+        """Vectorized screen_list agrees with per-ticker screen_ticker."""
+        financial_data = {
+            'GOOD': {
+                'ticker': 'GOOD', 'company_name': 'Good Co', 'market_cap': 5e9, 'pe_ratio': 15.0,
+                'income_statement': {'Total Revenue': 110.0, 'Net Income': 20.0},
+                'balance_sheet': {'Total Current Assets': 300.0, 'Total Current Liabilities': 100.0},
+                'prev_income_statement': {'Total Revenue': 100.0},
+            },
+            'BAD': {
+                'ticker': 'BAD', 'company_name': 'Bad Co', 'market_cap': 5e8, 'pe_ratio': None,
+                'income_statement': {'Total Revenue': 90.0},
+                'balance_sheet': {'Total Current Assets': 100.0, 'Total Current Liabilities': 100.0},
+                'prev_income_statement': {'Total Revenue': 100.0},
+            },
+        }
+        fetcher = DataFetcher(use_cache=False)
+        fetcher.get_financial_data = lambda ticker: financial_data.get(ticker)
+        fetcher.get_financial_data_batch = lambda tickers, **kwargs: {t: financial_data.get(t) for t in tickers}
+        screener = StockScreener(self.criteria_config, fetcher=fetcher)
+
+        results_df = screener.screen_list(['GOOD', 'BAD', 'MISSING'])
+
+        for row in results_df.to_dict(orient='records'):
+            expected = screener.screen_ticker(row['ticker'])
+            for key in ('passed_criteria', 'total_criteria', 'failed_criteria', 'status'):
+                self.assertEqual(row[key], expected[key], f"{row['ticker']}.{key}")
+
+    @patch('src.data.fetcher.yf.Tickers')
+    def test_screen_list_concurrent_fetch(self, mock_tickers):
+        """Tickers fetched concurrently (finishing in any order) aggregate to the same results."""
+        import time
+        tickers = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF']
+        delays = dict(zip(tickers, [0.03, 0.0, 0.02, 0.01, 0.025, 0.005]))
+        
+        def fake_fetch(ticker, retries=3, stock=None):
+            time.sleep(delays[ticker])
+            return {
+                'ticker': ticker, 'company_name': ticker, 'market_cap': 2e9,
+                'pe_ratio': 10.0 if ticker < 'DDD' else 40.0,
+                'income_statement': {},
+                'balance_sheet': {'Total Current Assets': 300.0, 'Total Current Liabilities': 100.0},
+                'prev_income_statement': {},
+            }
+        
+        fetcher = DataFetcher(use_cache=False)
+        screener = StockScreener(self.criteria_config, fetcher=fetcher, max_workers=4)
+        with patch.object(fetcher, '_fetch_uncached', side_effect=fake_fetch):
+            results_df = screener.screen_list(tickers)
+        
+        self.assertEqual(results_df['ticker'].tolist(), tickers)
+        by_ticker = results_df.sort_values('ticker').set_index('ticker')
+        self.assertEqual(by_ticker['status'].tolist(), ['PASS', 'PASS', 'PASS', 'FAIL', 'FAIL', 'FAIL'])
     
     def test_filter_by_criteria(self):
         """Test filtering DataFrame by criteria."""
@@ -265,6 +506,195 @@ class TestStockScreener(unittest.TestCase):
         self.assertEqual(len(filtered), 2)
         self.assertTrue(all(filtered['status'] == 'PASS'))
 
+    def test_filter_by_criteria_categorical_status(self):
+        """Test filtering on the categorical status column screen_list produces."""
+        df = pd.DataFrame({'ticker': ['AAPL', 'MSFT', 'GOOGL']})
+        df['status'] = pd.Categorical(['FAIL', 'PASS', 'PASS'], dtype=STATUS_DTYPE)
+
+        screener = StockScreener(self.criteria_config)
+        filtered = screener.filter_by_criteria(df)
+
+        self.assertEqual(filtered['ticker'].tolist(), ['MSFT', 'GOOGL'])
+        self.assertTrue(all(filtered['status'] == 'PASS'))
+
+
+class TestDataFetcher(unittest.TestCase):
+    """Test DataFetcher caching, batching and ratio calculation."""
+
+    def test_cache_round_trip(self):
+        """Cached financial data reloads with the same values."""
+        import tempfile
+        data = {
+            'ticker': 'AAPL',
+            'company_name': 'Apple Inc.',
+            'market_cap': 2000000000,
+            'pe_ratio': 20.0,
+            'income_statement': {'Total Revenue': 100000000, 'Net Income': 10000000},
+            'balance_sheet': {'Total Current Assets': 150000000, 'Total Current Liabilities': 100000000},
+            'prev_income_statement': {'Total Revenue': 90000000},
+            'info': {'longBusinessSummary': 'x' * 1000},
+        }
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = DataFetcher(cache_dir=Path(cache_dir))
+            fetcher._write_cache('AAPL', data)
+            fetcher._memory_cache.clear()  # force a read back from SQLite
+            cached = fetcher._load_cache('AAPL')
+
+        self.assertIsNotNone(cached)
+        self.assertTrue(cached['_cache_hit'])
+        self.assertEqual(cached['company_name'], 'Apple Inc.')
+        self.assertEqual(cached['market_cap'], 2000000000)
+        # Series.equals treats NaN (missing ratio) in the same position as equal
+        self.assertTrue(pd.Series(fetcher.calculate_ratios(cached)).equals(pd.Series(fetcher.calculate_ratios(data))))
+        self.assertNotIn('info', cached)
+
+    def test_cache_hit_skips_fetch(self):
+        """A fresh cache entry is returned without rate limiting or fetching."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = DataFetcher(cache_dir=Path(cache_dir))
+            fetcher._write_cache('AAPL', {'ticker': 'AAPL', 'company_name': 'Apple Inc.'})
+            with patch.object(fetcher, '_fetch_uncached') as mock_fetch:
+                result = fetcher.get_financial_data('AAPL')
+
+        mock_fetch.assert_not_called()
+        self.assertEqual(result['company_name'], 'Apple Inc.')
+
+    def test_memory_cache_serves_repeat_loads(self):
+        """Repeat loads of a fresh entry are served from memory, not SQLite."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = DataFetcher(cache_dir=Path(cache_dir))
+            fetcher._write_cache('AAPL', {'ticker': 'AAPL'})
+            fetcher._memory_cache.clear()
+            first = fetcher._load_cache('AAPL')
+            fetcher.db.close()
+            fetcher.db = Mock()
+            second = fetcher._load_cache('aapl')
+        
+        fetcher.db.execute.assert_not_called()
+        self.assertIs(second, first)
+    
+    def test_stale_cache_entry_is_ignored(self):
+        """Entries older than the TTL are treated as misses."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = DataFetcher(cache_dir=Path(cache_dir), cache_ttl_hours=1.0)
+            with patch('src.data.fetcher.time.time', return_value=1000.0):
+                fetcher._write_cache('AAPL', {'ticker': 'AAPL'})
+            with patch('src.data.fetcher.time.time', return_value=1000.0 + 3599):
+                self.assertIsNotNone(fetcher._load_cache('AAPL'))
+            with patch('src.data.fetcher.time.time', return_value=1000.0 + 3601):
+                self.assertIsNone(fetcher._load_cache('AAPL'))
+
+    def test_prepare_batch_fixes_freshness_cutoff(self):
+        """After prepare_batch() cache reads use the stored cutoff, not the clock."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = DataFetcher(cache_dir=Path(cache_dir), cache_ttl_hours=1.0)
+            with patch('src.data.fetcher.time.time', return_value=1000.0):
+                fetcher._write_cache('AAPL', {'ticker': 'AAPL'})
+            with patch('src.data.fetcher.time.time', return_value=1000.0 + 3599):
+                fetcher.prepare_batch()
+            with patch('src.data.fetcher.time.time', side_effect=AssertionError('clock read')):
+                self.assertIsNotNone(fetcher._load_cache('AAPL'))
+
+    def test_screen_list_clears_freshness_cutoff(self):
+        """Once a screen is done, a long-lived fetcher checks freshness against the clock again."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = DataFetcher(cache_dir=Path(cache_dir), cache_ttl_hours=1.0)
+            with patch('src.data.fetcher.time.time', return_value=1000.0):
+                fetcher._write_cache('AAPL', {'ticker': 'AAPL'})
+            screener = StockScreener({'pe_max': 25}, fetcher=fetcher)
+            with patch('src.data.fetcher.time.time', return_value=1000.0 + 60):
+                screener.screen_list(['AAPL'])
+            self.assertIsNone(fetcher._freshness_cutoff)
+
+            # Two hours later the entry is past its TTL, even from memory
+            with patch('src.data.fetcher.time.time', return_value=1000.0 + 7200):
+                self.assertIsNone(fetcher._load_cache('AAPL'))
+
+    @patch('src.data.fetcher.yf.Tickers')
+    def test_batch_fetch_only_requests_misses(self, mock_tickers):
+        """Batch fetch serves cache hits and downloads only the misses."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = DataFetcher(cache_dir=Path(cache_dir))
+            fetcher._write_cache('AAPL', {'ticker': 'AAPL', 'company_name': 'Apple Inc.'})
+            with patch.object(fetcher, '_fetch_uncached', return_value=None) as mock_fetch:
+                results = fetcher.get_financial_data_batch(['AAPL', 'MSFT'])
+
+        mock_tickers.assert_called_once()
+        self.assertEqual(mock_tickers.call_args[0][0], 'MSFT')
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(results['AAPL']['company_name'], 'Apple Inc.')
+        self.assertIsNone(results['MSFT'])
+
+    @patch('src.data.fetcher.yf.Tickers')
+    def test_batch_fetch_slow_ticker_does_not_block_later_chunks(self, mock_tickers):
+        """Later chunks are fetched while a ticker in an earlier chunk is still running."""
+        import threading
+        last_started = threading.Event()
+        waited = []
+
+        def fetch(ticker, retries, stock):
+            if ticker == 'A':
+                waited.append(last_started.wait(timeout=5))
+            elif ticker == 'D':
+                last_started.set()
+            return {'ticker': ticker}
+
+        fetcher = DataFetcher(use_cache=False)
+        with patch.object(DataFetcher, 'BATCH_SIZE', 2), patch.object(fetcher, '_fetch_uncached', side_effect=fetch):
+            results = fetcher.get_financial_data_batch(['A', 'B', 'C', 'D'], max_workers=2)
+
+        self.assertEqual(waited, [True])
+        self.assertEqual(sorted(results), ['A', 'B', 'C', 'D'])
+
+    def test_calculate_ratios_batch_matches_scalar(self):
+        """Vectorized ratios agree with calculate_ratios, including missing data."""
+        fetcher = DataFetcher(use_cache=False)
+        complete = {
+            'income_statement': {'Total Revenue': 110.0, 'Net Income': 12.0},
+            'balance_sheet': {
+                'Total Current Assets': 150.0, 'Total Current Liabilities': 100.0,
+                'Total Debt': 40.0, 'Stockholders Equity': 80.0,
+            },
+            'prev_income_statement': {'Total Revenue': 100.0},
+        }
+        partial = {
+            'income_statement': {'Total Revenue': 50.0},
+            'balance_sheet': {'Total Current Assets': 10.0, 'Total Current Liabilities': 0.0},
+            'prev_income_statement': {},
+        }
+        batch = fetcher.calculate_ratios_batch([complete, partial, None])
+
+        self.assertEqual(len(batch), 3)
+        for row, data in zip(batch.to_dict(orient='records'), [complete, partial]):
+            for key, expected in fetcher.calculate_ratios(data).items():
+                if pd.isna(expected):
+                    self.assertTrue(pd.isna(row[key]), key)
+                else:
+                    self.assertAlmostEqual(row[key], expected, msg=key)
+        self.assertTrue(batch.iloc[2].isna().all())
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test the token-bucket rate limiter."""
+
+    @patch('src.data.fetcher.time.sleep')
+    def test_burst_then_throttle(self, mock_sleep):
+        """Requests within capacity run immediately; the next one waits."""
+        bucket = TokenBucket(capacity=3, refill_rate=0.001)
+        for _ in range(3):
+            bucket.acquire()
+        mock_sleep.assert_not_called()
+
+        bucket.acquire()
+        mock_sleep.assert_called_once()
+        self.assertGreater(mock_sleep.call_args[0][0], 0)
+
 
 class TestTickerFileParsing(unittest.TestCase):
     """Test ticker file parsing utility."""
@@ -279,6 +709,252 @@ class TestTickerFileParsing(unittest.TestCase):
             tickers = _load_tickers_from_file(Path(tmp.name))
         self.assertEqual(tickers, ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META'])
 
+    def test_normalize_tickers(self):
+        """Inline ticker strings split on commas and any whitespace."""
+        self.assertEqual(normalize_tickers(" aapl, msft\ngoogl\t,,META "), ['AAPL', 'MSFT', 'GOOGL', 'META'])
+        self.assertEqual(normalize_tickers(""), [])
+
+    def test_load_tickers_trailing_comments_and_duplicates(self):
+        """Trailing comments are ignored and repeated tickers (any case) kept once."""
+        import tempfile
+        content = "AAPL, msft\nGOOGL  # trailing comment\naapl,MSFT\n"
+        with tempfile.NamedTemporaryFile(mode='w+', delete=True) as tmp:
+            tmp.write(content)
+            tmp.flush()
+            tickers = _load_tickers_from_file(Path(tmp.name))
+        self.assertEqual(tickers, ['AAPL', 'MSFT', 'GOOGL'])
+
+    def test_load_tickers_from_empty_file(self):
+        """An empty ticker file yields no tickers."""
+        import tempfile
+        with tempfile.NamedTemporaryFile(mode='w+', delete=True) as tmp:
+            self.assertEqual(_load_tickers_from_file(Path(tmp.name)), [])
+
+
+class TestCliAsync(unittest.TestCase):
+    """Test the CLI's --async path."""
+
+    def test_async_uses_threads_option(self):
+        """--threads sets the async concurrency and the size of the fetch thread pool."""
+        import tempfile
+        import asyncio
+        from click.testing import CliRunner
+        from src.utils.cli import cli
+        seen = {}
+
+        async def screen_list_async(tickers, concurrency=32):
+            seen['concurrency'] = concurrency
+            seen['workers'] = asyncio.get_running_loop()._default_executor._max_workers
+            return pd.DataFrame({'ticker': tickers, 'status': ['PASS'] * len(tickers)})
+
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch('src.data.fetcher.DataFetcher'), \
+                patch('src.screener.screener.StockScreener') as mock_screener_class:
+            mock_screener_class.return_value.screen_list_async = screen_list_async
+            mock_screener_class.return_value.criteria_functions = []
+            result = CliRunner().invoke(cli, [
+                'screen', '--tickers', 'AAPL,MSFT', '--criteria', 'pe_max=25', '--async', '--threads', '3',
+                '--output', str(Path(tmp_dir) / 'out.csv'),
+            ])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(seen, {'concurrency': 3, 'workers': 3})
+
+
+class WebAppTestCase(unittest.TestCase):
+    """Base for web app tests: environment files and reports live in a temporary directory."""
+
+    def setUp(self):
+        import tempfile
+        from src.web import app as web
+        self.web = web
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        tmp = Path(self.tmp_dir.name)
+        self.snapshot_path = tmp / 'environments.json'
+        self.log_path = tmp / 'environments.log'
+        for name, path in (
+            ('ENVIRONMENTS_PATH', self.snapshot_path),
+            ('ENV_LOG_PATH', self.log_path),
+            ('ENV_LOCK_PATH', tmp / 'environments.lock'),
+            ('REPORTS_DIR', tmp),
+        ):
+            patcher = patch.object(web, name, path)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.restart()
+        self.client = web.app.test_client()
+
+    def restart(self):
+        """Drop the in-memory cache, as a fresh process would start."""
+        self.web._ENV_CACHE.update(by_id=None, mtime=None, log_offset=0, log_mtime=None, log_entries=0, snapshot_ok=True)
+
+    def names(self):
+        return sorted(env['name'] for env in self.client.get('/api/environments').get_json())
+
+
+class TestJsonProvider(unittest.TestCase):
+    """Test the orjson-backed jsonify()."""
+
+    def test_response_arguments(self):
+        """jsonify() accepts one value, several values or keyword arguments, but not a mix."""
+        from flask import jsonify
+        from src.web.app import app
+        with app.app_context():
+            self.assertEqual(jsonify({'x': float('nan')}).get_json(), {'x': None})
+            self.assertEqual(jsonify(1, 2).get_json(), [1, 2])
+            self.assertEqual(jsonify(a=1).get_json(), {'a': 1})
+            self.assertEqual(jsonify().get_data(), b'null')
+            with self.assertRaises(TypeError):
+                jsonify(1, a=2)
+
+
+class TestEnvironmentStore(WebAppTestCase):
+    """Test the web app's environment snapshot + append-only log."""
+
+    def test_changes_survive_reload(self):
+        """Create, update and delete are all replayed after a restart."""
+        keep = self.client.post('/api/environments', json={'name': 'keep'}).get_json()
+        drop = self.client.post('/api/environments', json={'name': 'drop'}).get_json()
+        self.client.put(f"/api/environments/{keep['id']}", json={'name': 'renamed', 'tickers': 'aapl msft'})
+        self.client.delete(f"/api/environments/{drop['id']}")
+        self.assertEqual(len(self.log_path.read_bytes().splitlines()), 4)
+
+        self.restart()
+        self.assertEqual(self.names(), ['renamed'])
+        env = self.client.get('/api/environments').get_json()[0]
+        self.assertEqual(env['tickers'], ['AAPL', 'MSFT'])
+        # Loading folded the log into the snapshot
+        self.assertEqual(self.log_path.read_bytes(), b'')
+
+    def test_log_compacted_at_threshold(self):
+        """The log is folded into environments.json after ENV_LOG_COMPACT_AT changes."""
+        import orjson
+        with patch.object(self.web, 'ENV_LOG_COMPACT_AT', 3):
+            for name in ('a', 'b'):
+                self.client.post('/api/environments', json={'name': name})
+            self.assertEqual(len(self.log_path.read_bytes().splitlines()), 2)
+            self.client.post('/api/environments', json={'name': 'c'})
+
+        self.assertEqual(self.log_path.read_bytes(), b'')
+        snapshot = orjson.loads(self.snapshot_path.read_bytes())
+        self.assertEqual([env['name'] for env in snapshot], ['a', 'b', 'c'])
+        self.restart()
+        self.assertEqual(self.names(), ['a', 'b', 'c'])
+
+    def test_failed_compaction_keeps_snapshot_and_log(self):
+        """A compaction that fails mid-way leaves the old snapshot and the log intact."""
+        with patch.object(self.web, 'ENV_LOG_COMPACT_AT', 1):
+            self.client.post('/api/environments', json={'name': 'first'})
+        self.client.post('/api/environments', json={'name': 'second'})
+        snapshot = self.snapshot_path.read_bytes()
+        log = self.log_path.read_bytes()
+
+        self.restart()
+        with patch('src.web.app.os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.web._load_environments()
+        self.assertEqual(self.snapshot_path.read_bytes(), snapshot)
+        self.assertEqual(self.log_path.read_bytes(), log)
+
+        self.restart()
+        self.assertEqual(self.names(), ['first', 'second'])
+
+    def test_unreadable_snapshot_is_not_overwritten(self):
+        """An environments.json that does not parse is never replaced by a compaction."""
+        self.snapshot_path.write_bytes(b'[{"id": "lost"')
+        with patch.object(self.web, 'ENV_LOG_COMPACT_AT', 1):
+            with self.assertLogs('src.web.app', level='ERROR'):
+                self.client.post('/api/environments', json={'name': 'new'})
+            self.client.post('/api/environments', json={'name': 'newer'})
+
+        self.assertEqual(self.snapshot_path.read_bytes(), b'[{"id": "lost"')
+        self.assertEqual(len(self.log_path.read_bytes().splitlines()), 2)
+        self.assertEqual(self.names(), ['new', 'newer'])
+
+    def test_torn_last_line_is_dropped(self):
+        """A partial line left by a crash does not swallow later changes."""
+        self.log_path.write_bytes(b'{"op": "upsert", "env": {"id": "torn"')
+        self.client.post('/api/environments', json={'name': 'after-crash'})
+        self.assertEqual(self.names(), ['after-crash'])
+
+        self.restart()
+        self.assertEqual(self.names(), ['after-crash'])
+
+    def test_appends_from_another_process_are_replayed(self):
+        """Lines appended to the log behind the cache's back show up on the next read."""
+        self.client.post('/api/environments', json={'name': 'mine'})
+        with self.log_path.open('ab') as f:
+            f.write(b'{"op": "upsert", "env": {"id": "other", "name": "theirs"}}\n')
+
+        self.assertEqual(self.names(), ['mine', 'theirs'])
+        with patch.object(self.web, 'ENV_LOG_COMPACT_AT', 1):
+            self.client.post('/api/environments', json={'name': 'third'})
+        self.restart()
+        self.assertEqual(self.names(), ['mine', 'theirs', 'third'])
+
+
+class TestEnvironmentResults(WebAppTestCase):
+    """Test the run preview and paging results from the saved report."""
+
+    TICKERS = ['T0', 'T1', 'T2', 'T3', 'T4']
+
+    def setUp(self):
+        super().setUp()
+        fetcher = Mock()
+        fetcher.get_financial_data_batch.side_effect = lambda tickers, **kwargs: {
+            ticker: {'ticker': ticker, 'company_name': ticker, 'market_cap': 5e9, 'pe_ratio': 10.0}
+            for ticker in tickers
+        }
+        fetcher.calculate_ratios_batch.side_effect = DataFetcher(use_cache=False).calculate_ratios_batch
+        patcher = patch.object(self.web, '_get_fetcher', return_value=fetcher)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.env_id = self.client.post('/api/environments', json={
+            'name': 'paging', 'tickers': ','.join(self.TICKERS),
+            'criteria': 'pe_max=25', 'use_default_criteria': False,
+        }).get_json()['id']
+
+    def page(self, **params):
+        return self.client.get(f'/api/environments/{self.env_id}/results', query_string=params).get_json()
+
+    def test_run_returns_total_and_first_page(self):
+        """The run response carries the full summary but only the preview rows."""
+        body = self.client.post(f'/api/environments/{self.env_id}/run?preview=2').get_json()
+
+        self.assertEqual(body['summary']['total'], 5)
+        self.assertEqual(body['summary']['passed'], 5)
+        self.assertEqual([row['ticker'] for row in body['results']], ['T0', 'T1'])
+
+    def test_results_paging(self):
+        """offset/limit page through the saved report."""
+        self.client.post(f'/api/environments/{self.env_id}/run')
+
+        page = self.page(offset=2, limit=2)
+        self.assertEqual((page['total'], page['offset'], page['limit']), (5, 2, 2))
+        self.assertEqual([row['ticker'] for row in page['results']], ['T2', 'T3'])
+        self.assertEqual([row['ticker'] for row in self.page(offset=4, limit=2)['results']], ['T4'])
+
+    def test_results_limit_capped(self):
+        """limit is capped at RESULTS_PAGE_MAX."""
+        self.client.post(f'/api/environments/{self.env_id}/run')
+        with patch.object(self.web, 'RESULTS_PAGE_MAX', 3):
+            page = self.page(limit=100)
+
+        self.assertEqual(page['limit'], 3)
+        self.assertEqual(len(page['results']), 3)
+
+    def test_results_fall_back_to_json(self):
+        """Without the Parquet report, results are read from the JSON report."""
+        report = self.client.post(f'/api/environments/{self.env_id}/run').get_json()['report_paths']
+        self.assertIn('parquet', report)
+        Path(report['parquet']).unlink()
+
+        page = self.page(limit=10)
+        self.assertEqual(page['total'], 5)
+        self.assertEqual([row['ticker'] for row in page['results']], self.TICKERS)
+        self.assertEqual(page['results'][0]['status'], 'PASS')
+
 
 if __name__ == '__main__':
     unittest.main()